@@ -3,6 +3,8 @@ import json
 import sys
 from pathlib import Path
 
+import numpy as np
+
 # ruff: noqa: T201
 
 
@@ -12,17 +14,20 @@ def check_file_coverage(coverage_file: Path, threshold: float = 80.0) -> bool:
         data = json.load(f)
 
     files = data.get("files", {})
-    failed_files = []
+    filepaths = list(files)
+    coverages = np.fromiter(
+        (files[filepath]["summary"]["percent_covered"] for filepath in filepaths),
+        dtype=np.float64,
+        count=len(filepaths),
+    )
 
-    for filepath, stats in files.items():
-        coverage = stats["summary"]["percent_covered"]
-        if coverage < threshold:
-            failed_files.append((filepath, coverage))
+    failed = np.flatnonzero(coverages < threshold)
 
-    if failed_files:
+    if failed.size:
         print(f"\n❌ Files below {threshold}% coverage:")
-        for filepath, coverage in sorted(failed_files, key=lambda x: x[1]):
-            print(f"  {filepath}: {coverage:.2f}%")
+        # 安定ソートでカバレッジの低い順に表示
+        for i in failed[np.argsort(coverages[failed], kind="stable")]:
+            print(f"  {filepaths[i]}: {coverages[i]:.2f}%")
         return False
 
     print(f"\n✅ All files meet {threshold}% coverage threshold")
@@ -1,21 +1,26 @@
 """計算ルール関連のドメインモデル."""
 import ast
+import functools
 import operator
 import re
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, ClassVar
 
 import pandas as pd
 
+# 計算ルールの設定に必須のフィールド
+_REQUIRED_RULE_FIELDS = frozenset({"name", "formula"})
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CalculationRule:
     """計算ルールエンティティ."""
 
     name: str
     formula: str
     description: str = ""
-    group_by: list[str] = None
+    group_by: tuple[str, ...] = ()
 
     def __post_init__(self) -> None:
         """バリデーション."""
@@ -25,8 +30,9 @@ class CalculationRule:
         if not self.formula:
             msg = "計算式は必須です"
             raise ValueError(msg)
-        if self.group_by is None:
-            self.group_by = []
+        if not isinstance(self.group_by, tuple):
+            # YAML由来のリストやNoneをタプルに正規化
+            object.__setattr__(self, "group_by", tuple(self.group_by or ()))
 
 
 class CalculationEngine:
@@ -44,34 +50,38 @@ class CalculationEngine:
         ast.UAdd: operator.pos,
     }
 
-    # 安全な関数のマッピング
-    _FUNCTIONS: ClassVar[dict[str, Any]] = {
-        "SUM": pd.Series.sum,
-        "MEAN": pd.Series.mean,
-        "COUNT": pd.Series.count,
-        "MIN": pd.Series.min,
-        "MAX": pd.Series.max,
-        "STD": pd.Series.std,
-        "VAR": pd.Series.var,
+    # 安全とみなす末端ノードの型の一覧
+    _LEAF_NODES: ClassVar[frozenset[type[ast.AST]]] = frozenset({ast.Constant, ast.Name})
+
+    # 安全な関数のマッピング, 集約関数名 -> pandas の集約メソッド名
+    # 全体集約(Series)とグループ集約(groupby)の両方で同じメソッド名を使う
+    _FUNCTIONS: ClassVar[dict[str, str]] = {
+        "SUM": "sum",
+        "MEAN": "mean",
+        "COUNT": "count",
+        "MIN": "min",
+        "MAX": "max",
+        "STD": "std",
+        "VAR": "var",
     }
 
-    def __init__(self) -> None:
-        """計算エンジンを初期化."""
+    # 集約関数の検出と構文解析を1回の走査で行う
+    # 式全体が SUM(column) の形なら func/column に、式の途中に SUM( や sum ( を含むだけなら call にマッチ
+    _AGGREGATION_PATTERN: ClassVar[re.Pattern[str]] = re.compile(
+        rf"^ *(?P<func>{'|'.join(_FUNCTIONS)}) *\( *(?P<column>[a-zA-Z_][a-zA-Z0-9_]*) *\) *\Z"
+        rf"|\b(?P<call>{'|'.join(_FUNCTIONS)})\s*\(",
+        re.IGNORECASE,
+    )
 
     def validate_formula(self, formula: str) -> bool:
         """計算式の構文をバリデーションする."""
-        try:
-            # 集約関数の処理
-            if self.is_aggregation_formula(formula):
-                return self._validate_aggregation_formula(formula)
+        # 集約関数の処理
+        aggregation = self._AGGREGATION_PATTERN.search(formula)
+        if aggregation is not None:
+            return aggregation["func"] is not None
 
-            # 通常の四則演算の処理
-            tree = ast.parse(formula, mode="eval")
-            self._validate_ast_node(tree.body)
-        except (SyntaxError, ValueError, TypeError):
-            return False
-        else:
-            return True
+        # 通常の四則演算の処理, 不正な式が多くても例外を発生させずに判定する
+        return self._compile_formula(formula) is not None
 
     def apply_formula(
         self,
@@ -84,8 +94,9 @@ class CalculationEngine:
             computed_columns = {}
 
         try:
-            if self.is_aggregation_formula(rule.formula):
-                return self._apply_aggregation_formula(df, rule)
+            aggregation = self._AGGREGATION_PATTERN.search(rule.formula)
+            if aggregation is not None:
+                return self._apply_aggregation_formula(df, rule, aggregation)
             return self.apply_arithmetic_formula(df, rule.formula, computed_columns)
 
         except Exception as e:
@@ -94,40 +105,33 @@ class CalculationEngine:
 
     def is_aggregation_formula(self, formula: str) -> bool:
         """集約関数を含む式かどうかを判定."""
-        aggregation_functions = ["SUM", "MEAN", "COUNT", "MIN", "MAX", "STD", "VAR"]
-        formula_upper = formula.upper()
         # 関数呼び出しの形(関数名+括弧)で判定
-        return any(f"{func}(" in formula_upper for func in aggregation_functions)
-
-    def _validate_aggregation_formula(self, formula: str) -> bool:
-        """集約関数の構文をバリデーション."""
-        # 簡単な正規表現でSUM(column)形式をチェック
-        pattern = r"^(SUM|MEAN|COUNT|MIN|MAX|STD|VAR)\([a-zA-Z_][a-zA-Z0-9_]*\)$"
-        return bool(re.match(pattern, formula.replace(" ", ""), re.IGNORECASE))
+        return self._AGGREGATION_PATTERN.search(formula) is not None
 
     def _apply_aggregation_formula(
-        self, df: pd.DataFrame, rule: CalculationRule,
+        self,
+        df: pd.DataFrame,
+        rule: CalculationRule,
+        aggregation: re.Match[str],
+        derived_group_keys: dict[str, pd.Series] | None = None,
+        grouped_frames: dict[tuple[str, ...], pd.core.groupby.DataFrameGroupBy] | None = None,
     ) -> pd.Series:
         """集約計算を適用."""
-        func_name, column_name = self._parse_aggregation_formula(rule.formula)
+        func_name, column_name = self._parse_aggregation_formula(rule.formula, aggregation)
         self._validate_aggregation_column(df, column_name)
 
         if rule.group_by:
-            return self._apply_grouped_aggregation(df, rule, func_name, column_name)
+            grouped_frame = self._get_grouped_frame(df, rule.group_by, derived_group_keys, grouped_frames)
+            return self._execute_grouped_aggregation(grouped_frame[column_name], func_name)
         return self._apply_global_aggregation(df, func_name, column_name)
 
-    def _parse_aggregation_formula(self, formula: str) -> tuple[str, str]:
-        """集約関数の構文を解析して関数名と列名を返す."""
-        cleaned_formula = formula.replace(" ", "")
-        pattern = r"^(SUM|MEAN|COUNT|MIN|MAX|STD|VAR)\(([a-zA-Z_][a-zA-Z0-9_]*)\)$"
-        match = re.match(pattern, cleaned_formula, re.IGNORECASE)
-
-        if not match:
+    def _parse_aggregation_formula(self, formula: str, aggregation: re.Match[str]) -> tuple[str, str]:
+        """集約関数の検出結果から関数名と列名を返す."""
+        if aggregation["func"] is None:
             msg = f"集約関数の構文が不正です: {formula}"
             raise ValueError(msg)
 
-        func_name, column_name = match.groups()
-        return func_name.upper(), column_name
+        return aggregation["func"].upper(), aggregation["column"]
 
     def _validate_aggregation_column(self, df: pd.DataFrame, column_name: str) -> None:
         """集約対象の列が存在するかを検証."""
@@ -135,52 +139,70 @@ class CalculationEngine:
             msg = f"列が存在しません: {column_name}"
             raise ValueError(msg)
 
-    def _apply_grouped_aggregation(
-        self, df: pd.DataFrame, rule: CalculationRule, func_name: str, column_name: str,
-    ) -> pd.Series:
-        """グループ化された集約を適用."""
-        group_cols = self._prepare_group_columns(df, rule.group_by)
-        grouped = df.groupby(group_cols)[column_name]
-        return self._execute_grouped_aggregation(grouped, func_name)
-
-    def _prepare_group_columns(self, df: pd.DataFrame, group_by: list[str]) -> list[str]:
-        """グループ化用の列を準備する ex.) 日付変換などを含む."""
-        group_cols = []
+    def _get_grouped_frame(
+        self,
+        df: pd.DataFrame,
+        group_by: tuple[str, ...],
+        derived_group_keys: dict[str, pd.Series] | None = None,
+        grouped_frames: dict[tuple[str, ...], pd.core.groupby.DataFrameGroupBy] | None = None,
+    ) -> pd.core.groupby.DataFrameGroupBy:
+        """グループ化されたDataFrameを取得.
+
+        grouped_frames が渡された場合、同じ group_by のルール間で
+        キーのハッシュ化・ソート結果を持つ groupby オブジェクトを再利用する。
+        """
+        if grouped_frames is None:
+            grouped_frames = {}
+
+        grouped_frame = grouped_frames.get(group_by)
+        if grouped_frame is None:
+            group_keys = self._prepare_group_columns(df, group_by, derived_group_keys)
+            # カテゴリ型のキーは出現しないカテゴリの組み合わせまで展開しない
+            grouped_frame = df.groupby(group_keys, observed=True)
+            grouped_frames[group_by] = grouped_frame
+        return grouped_frame
+
+    def _prepare_group_columns(
+        self,
+        df: pd.DataFrame,
+        group_by: tuple[str, ...],
+        derived_group_keys: dict[str, pd.Series] | None = None,
+    ) -> list[str | pd.Series]:
+        """グループ化用のキーを準備する ex.) 日付変換などを含む.
+
+        変換が必要なキーは df を変更せず Series として返す。
+        derived_group_keys が渡された場合は変換結果を再利用する。
+        """
+        if derived_group_keys is None:
+            derived_group_keys = {}
+
+        group_keys: list[str | pd.Series] = []
         for group_col in group_by:
             if "::" in group_col:
                 col_name, transform = group_col.split("::")
                 if transform == "month" and col_name in df.columns:
-                    month_col = pd.to_datetime(df[col_name]).dt.to_period("M")
-                    df[f"{col_name}_month"] = month_col
-                    group_cols.append(f"{col_name}_month")
+                    if group_col not in derived_group_keys:
+                        month_col = pd.to_datetime(df[col_name]).dt.to_period("M")
+                        derived_group_keys[group_col] = month_col.rename(f"{col_name}_month")
+                    group_keys.append(derived_group_keys[group_col])
                 else:
-                    group_cols.append(col_name)
+                    group_keys.append(col_name)
             else:
-                group_cols.append(group_col)
-        return group_cols
+                group_keys.append(group_col)
+        return group_keys
 
     def _execute_grouped_aggregation(self, grouped: pd.core.groupby.SeriesGroupBy, func_name: str) -> pd.Series:
         """SeriesGroupByオブジェクトに対して集約関数を実行."""
-        aggregation_methods = {
-            "SUM": grouped.sum,
-            "MEAN": grouped.mean,
-            "COUNT": grouped.count,
-            "MIN": grouped.min,
-            "MAX": grouped.max,
-            "STD": grouped.std,
-            "VAR": grouped.var,
-        }
-
-        if func_name not in aggregation_methods:
+        method = self._FUNCTIONS.get(func_name)
+        if method is None:
             msg = f"サポートされていない集約関数: {func_name}"
             raise ValueError(msg)
 
-        return aggregation_methods[func_name]()
+        return grouped.agg(method)
 
     def _apply_global_aggregation(self, df: pd.DataFrame, func_name: str, column_name: str) -> pd.Series:
         """全体での集約を適用."""
-        func = self._FUNCTIONS[func_name]
-        result = func(df[column_name])
+        result = getattr(df[column_name], self._FUNCTIONS[func_name])()
         return pd.Series([result], index=[f"{func_name}({column_name})"])
 
     def apply_arithmetic_formula(
@@ -194,12 +216,13 @@ class CalculationEngine:
             computed_columns = {}
 
         try:
-            tree = ast.parse(formula, mode="eval")
-            result = self._evaluate_ast_node(tree.body, df, computed_columns)
+            body, names = self._parse_formula(formula)
+            self._validate_referenced_names(names, df, computed_columns)
+            result = self._evaluate_ast_node(body, df, computed_columns)
 
-            if isinstance(result, (int, float)):
-                # スカラー値の場合、DataFrameの行数分のSeriesを作成
-                return pd.Series([result] * len(df))
+            if pd.api.types.is_number(result):
+                # スカラー値の場合、リストを作らずDataFrameのindexへブロードキャスト
+                return pd.Series(result, index=df.index)
             if isinstance(result, pd.Series):
                 return result
 
@@ -213,106 +236,172 @@ class CalculationEngine:
             msg = f"四則演算の処理に失敗しました: {formula} - {e!s}"
             raise ValueError(msg) from e
 
-    def _validate_ast_node(self, node: ast.AST) -> None:
-        """AST/ノードの安全性をバリデーション."""
-        if isinstance(node, ast.BinOp):
-            if type(node.op) not in self._OPERATORS:
-                msg = f"サポートされていない演算子: {type(node.op).__name__}"
-                raise ValueError(msg)
-            self._validate_ast_node(node.left)
-            self._validate_ast_node(node.right)
-
-        elif isinstance(node, ast.UnaryOp):
-            if type(node.op) not in self._OPERATORS:
-                msg = f"サポートされていない単項演算子: {type(node.op).__name__}"
-                raise ValueError(msg)
-            self._validate_ast_node(node.operand)
-
-        elif isinstance(node, (ast.Constant, ast.Num)):
-            # 数値リテラルは安全
-            pass
+    def _parse_formula(self, formula: str) -> tuple[ast.expr, tuple[str, ...]]:
+        """計算式を構文解析・検証し、式のASTと参照する変数名を返す(結果はキャッシュ)."""
+        compiled = self._compile_formula(formula)
+        if compiled is None:
+            # 不正な式のみ再度解析し、原因を示す例外を発生させる
+            tree = ast.parse(formula, mode="eval")
+            self._validate_ast_node(tree.body)
+        return compiled
 
-        elif isinstance(node, ast.Name):
-            # 変数名(列名)は安全
-            pass
+    @classmethod
+    @functools.lru_cache(maxsize=512)
+    def _compile_formula(cls, formula: str) -> tuple[ast.expr, tuple[str, ...]] | None:
+        """計算式を構文解析・検証し、式のASTと参照する変数名を返す. 不正な式は None.
 
-        else:
-            msg = f"サポートされていないAST要素: {type(node).__name__}"
-            raise TypeError(msg)
+        エンジンのインスタンス間で共有される上限付きのキャッシュを持つ。
+        キャッシュしたASTは評価時に読み取るだけで変更しない。
+        """
+        try:
+            tree = ast.parse(formula, mode="eval")
+        except (SyntaxError, ValueError):
+            return None
+        if not cls._check_ast_node(tree.body):
+            return None
+        return tree.body, cls._collect_names(tree)
+
+    @staticmethod
+    def _collect_names(tree: ast.AST) -> tuple[str, ...]:
+        """AST中の変数名を出現順に重複なく取得."""
+        return tuple(dict.fromkeys(
+            node.id for node in ast.walk(tree) if isinstance(node, ast.Name)
+        ))
+
+    def _validate_referenced_names(
+        self,
+        names: tuple[str, ...],
+        df: pd.DataFrame,
+        computed_columns: dict,
+    ) -> None:
+        """式中の変数名が計算済み列または元の列に存在するかを検証."""
+        for name in names:
+            if name not in computed_columns and name not in df.columns:
+                msg = f"列または計算済み変数が存在しません: {name}"
+                raise ValueError(msg)
 
     def _evaluate_ast_node(
         self,
         node: ast.AST,
         df: pd.DataFrame,
-        computed_columns: dict | None = None,
-    ) -> float | pd.Series:
-        """AST/ノードを評価して値を返す."""
-        if computed_columns is None:
-            computed_columns = {}
-
-        if isinstance(node, ast.BinOp):
+        computed_columns: dict,
+    ) -> Any:  # noqa: ANN401
+        """検証済みのAST/ノードを評価して値を返す.
+
+        変数名は計算済み列、元の列の順に解決する。
+        """
+        node_type = type(node)
+        if node_type is ast.BinOp:
             left = self._evaluate_ast_node(node.left, df, computed_columns)
             right = self._evaluate_ast_node(node.right, df, computed_columns)
-            op_func = self._OPERATORS[type(node.op)]
-            return op_func(left, right)
-
-        if isinstance(node, ast.UnaryOp):
+            return self._OPERATORS[type(node.op)](left, right)
+        if node_type is ast.UnaryOp:
             operand = self._evaluate_ast_node(node.operand, df, computed_columns)
-            op_func = self._OPERATORS[type(node.op)]
-            return op_func(operand)
-
-        if isinstance(node, ast.Constant):
+            return self._OPERATORS[type(node.op)](operand)
+        if node_type is ast.Constant:
             return node.value
+        if node_type is ast.Name:
+            if node.id in computed_columns:
+                return computed_columns[node.id]
+            return df[node.id]
 
-        if isinstance(node, ast.Num):  # Python 3.7以前の互換性
-            return node.n
-
-        if isinstance(node, ast.Name):
-            column_name = node.id
+        msg = f"評価できないAST要素: {node_type.__name__}"
+        raise ValueError(msg)
 
-            # まず計算済み列をチェック
-            if column_name in computed_columns:
-                return computed_columns[column_name]
+    @classmethod
+    def _check_ast_node(cls, node: ast.AST) -> bool:
+        """AST/ノードが安全かどうかを判定(例外を発生させない)."""
+        # isinstance の連鎖ではなく型の一致で判定する
+        node_type = type(node)
+        if node_type is ast.BinOp:
+            return (
+                type(node.op) in cls._OPERATORS
+                and cls._check_ast_node(node.left)
+                and cls._check_ast_node(node.right)
+            )
+        if node_type is ast.UnaryOp:
+            return type(node.op) in cls._OPERATORS and cls._check_ast_node(node.operand)
+        # 数値リテラルと変数名(列名)は安全
+        return node_type in cls._LEAF_NODES
 
-            # 次に元のDataFrame列をチェック
-            if column_name in df.columns:
-                return df[column_name]
+    def _validate_ast_node(self, node: ast.AST) -> None:
+        """AST/ノードの安全性をバリデーション."""
+        node_type = type(node)
+        if node_type in self._LEAF_NODES:
+            # 数値リテラルと変数名(列名)は安全
+            return
+
+        validator = self._NODE_VALIDATORS.get(node_type)
+        if validator is None:
+            msg = f"サポートされていないAST要素: {node_type.__name__}"
+            raise TypeError(msg)
+        validator(self, node)
 
-            msg = f"列または計算済み変数が存在しません: {column_name}"
+    def _validate_bin_op(self, node: ast.BinOp) -> None:
+        """二項演算ノードの安全性をバリデーション."""
+        if type(node.op) not in self._OPERATORS:
+            msg = f"サポートされていない演算子: {type(node.op).__name__}"
             raise ValueError(msg)
+        self._validate_ast_node(node.left)
+        self._validate_ast_node(node.right)
 
-        msg = f"評価できないAST要素: {type(node).__name__}"
-        raise ValueError(msg)
+    def _validate_unary_op(self, node: ast.UnaryOp) -> None:
+        """単項演算ノードの安全性をバリデーション."""
+        if type(node.op) not in self._OPERATORS:
+            msg = f"サポートされていない単項演算子: {type(node.op).__name__}"
+            raise ValueError(msg)
+        self._validate_ast_node(node.operand)
 
+    # AST要素の型 -> 検証メソッド, isinstance の連鎖ではなく型で直接引く
+    _NODE_VALIDATORS: ClassVar[dict[type[ast.AST], Callable[[Any, Any], None]]] = {
+        ast.BinOp: _validate_bin_op,
+        ast.UnaryOp: _validate_unary_op,
+    }
 
     def apply_multiple_rules(
         self, df: pd.DataFrame, rules: list[CalculationRule],
     ) -> pd.DataFrame:
         """複数の計算ルールを順次適用してDataFrameを拡張."""
-        result_df = df.copy()
         computed_columns = {}
+        # 元のDataFrameと同じ長さの計算結果は、最後にまとめて列として追加する
+        series_columns: dict[str, pd.Series] = {}
+        # 日付の月次変換などのグループ化キーとgroupbyオブジェクトはルール間で再利用する
+        derived_group_keys: dict[str, pd.Series] = {}
+        grouped_frames: dict[tuple[str, ...], pd.core.groupby.DataFrameGroupBy] = {}
+        # 集約対象のDataFrame, 計算済み列が追加された時だけ作り直す
+        aggregation_source: pd.DataFrame | None = None
 
         for rule in rules:
             try:
-                if self.is_aggregation_formula(rule.formula):
-                    # 集約処理は別途処理が必要
-                    computed_result = self._apply_aggregation_formula(result_df, rule)
+                aggregation = self._AGGREGATION_PATTERN.search(rule.formula)
+                if aggregation is not None:
+                    # 集約処理は別途処理が必要, 計算済み列も集約対象にできるよう付与して渡す
+                    if aggregation_source is None:
+                        aggregation_source = df.assign(**series_columns)
+                    computed_result = self._apply_aggregation_formula(
+                        aggregation_source, rule, aggregation, derived_group_keys, grouped_frames,
+                    )
                 else:
                     computed_result = self.apply_arithmetic_formula(
-                        result_df, rule.formula, computed_columns,
+                        df, rule.formula, computed_columns,
                     )
 
                 # 計算結果を保存
                 computed_columns[rule.name] = computed_result
                 is_series = isinstance(computed_result, pd.Series)
-                if is_series and len(computed_result) == len(result_df):
-                    result_df[rule.name] = computed_result
+                if is_series and len(computed_result) == len(df):
+                    series_columns[rule.name] = computed_result
+                    aggregation_source = None
+                    grouped_frames.clear()
+                    # 変換元の列が上書きされた場合、その列から派生したキーは破棄
+                    for key in [k for k in derived_group_keys if k.startswith(f"{rule.name}::")]:
+                        del derived_group_keys[key]
 
             except Exception as e:
                 msg = f"計算ルール '{rule.name}' の適用に失敗しました: {e!s}"
                 raise ValueError(msg) from e
 
-        return result_df
+        return df.assign(**series_columns)
 
 
 def parse_calculation_rules(rules_data: list[dict[str, Any]]) -> list[CalculationRule]:
@@ -320,23 +409,24 @@ def parse_calculation_rules(rules_data: list[dict[str, Any]]) -> list[Calculatio
     rules = []
 
     for rule_data in rules_data:
-        try:
-            rule = CalculationRule(
-                name=rule_data["name"],
-                formula=rule_data["formula"],
-                description=rule_data.get("description", ""),
-                group_by=rule_data.get("group_by", []),
-            )
+        # 不足しているフィールドを1回の集合演算でまとめて検出
+        missing_fields = _REQUIRED_RULE_FIELDS - rule_data.keys()
+        if missing_fields:
+            msg = f"必須フィールドが不足しています: {', '.join(sorted(missing_fields))}"
+            raise ValueError(msg)
 
-            # 基本的な構文チェック, 変数参照は実行時にチェック
-            if not rule.formula.strip():
-                msg = f"計算式が空です: {rule.name}"
-                raise ValueError(msg)
+        rule = CalculationRule(
+            name=rule_data["name"],
+            formula=rule_data["formula"],
+            description=rule_data.get("description", ""),
+            group_by=tuple(rule_data.get("group_by") or ()),
+        )
 
-            rules.append(rule)
+        # 基本的な構文チェック, 変数参照は実行時にチェック
+        if not rule.formula.strip():
+            msg = f"計算式が空です: {rule.name}"
+            raise ValueError(msg)
 
-        except KeyError as e:
-            msg = f"必須フィールドが不足しています: {e}"
-            raise ValueError(msg) from e
+        rules.append(rule)
 
     return rules
@@ -1,11 +1,11 @@
 """データフォーマット関連のドメインモデル."""
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import Any, ClassVar
 
 import pandas as pd
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ColumnDefinition:
     """CSV列定義エンティティ."""
 
@@ -33,6 +33,8 @@ class DataFormat:
     """データフォーマットエンティティ."""
 
     columns: list[ColumnDefinition]
+    _by_name: dict[str, ColumnDefinition] = field(init=False, repr=False, compare=False)
+    _required_columns: tuple[ColumnDefinition, ...] = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """バリデーション."""
@@ -40,27 +42,37 @@ class DataFormat:
             msg = "少なくとも1つの列定義が必要です"
             raise ValueError(msg)
 
-        # 列名の重複チェック
-        column_names = [col.name for col in self.columns]
-        if len(column_names) != len(set(column_names)):
-            msg = "列名が重複しています"
-            raise ValueError(msg)
+        # 列名の重複チェックと同時に列名 -> 列定義の索引を構築
+        by_name: dict[str, ColumnDefinition] = {}
+        for col in self.columns:
+            if col.name in by_name:
+                msg = "列名が重複しています"
+                raise ValueError(msg)
+            by_name[col.name] = col
+
+        self._by_name = by_name
+        self._required_columns = tuple(col for col in self.columns if col.required)
 
     def get_column_by_name(self, name: str) -> ColumnDefinition | None:
         """列名で列定義を取得."""
-        for column in self.columns:
-            if column.name == name:
-                return column
-        return None
+        return self._by_name.get(name)
 
     def get_required_columns(self) -> list[ColumnDefinition]:
         """必須列の一覧を取得."""
-        return [col for col in self.columns if col.required]
+        # 保持している一覧を呼び出し側が変更しないよう、新しいリストで返す
+        return list(self._required_columns)
 
 
 class DataValidator:
     """データ検証クラス."""
 
+    # True / False とみなす文字列表現(小文字に正規化して比較)
+    _TRUE_VALUES: ClassVar[frozenset[str]] = frozenset({"true", "1", "yes", "t"})
+    _FALSE_VALUES: ClassVar[frozenset[str]] = frozenset({"false", "0", "no", "f"})
+
+    # 変換エラーのメッセージに含める、解釈できない値の最大件数
+    _MAX_REPORTED_VALUES: ClassVar[int] = 5
+
     def __init__(self, data_format: DataFormat) -> None:
         """データバリデーターを初期化."""
         self.data_format = data_format
@@ -82,20 +94,20 @@ class DataValidator:
 
     def convert_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """DataFrameの型を設定に従って変換."""
-        df_converted = df.copy()
+        converted: dict[str, pd.Series] = {}
 
         for column_def in self.data_format.columns:
-            if column_def.name in df_converted.columns:
+            if column_def.name in df.columns:
                 try:
-                    df_converted[column_def.name] = self._convert_column(
-                        df_converted[column_def.name],
+                    converted[column_def.name] = self._convert_column(
+                        df[column_def.name],
                         column_def,
                     )
                 except Exception as e:
                     msg = f"列 '{column_def.name}' の型変換に失敗しました: {e!s}"
                     raise ValueError(msg) from e
 
-        return df_converted
+        return df.assign(**converted)
 
     def _validate_columns_exist(self, df: pd.DataFrame) -> list[str]:
         """必須列の存在チェック."""
@@ -111,18 +123,22 @@ class DataValidator:
     def _validate_required_columns(self, df: pd.DataFrame) -> list[str]:
         """必須列の空値チェック."""
         errors = []
-
-        for column_def in self.data_format.get_required_columns():
-            if column_def.name in df.columns:
-                null_count = df[column_def.name].isna().sum()
-                if null_count > 0:
-                    msg = f"必須列 '{column_def.name}' に {null_count} 個の空値があります"
-                    errors.append(msg)
+        required_names = [
+            col.name for col in self.data_format.get_required_columns() if col.name in df.columns
+        ]
+        if not required_names:
+            return errors
+
+        # 必須列の空値数をまとめて集計
+        null_counts = df[required_names].isna().sum()
+        for name, null_count in null_counts[null_counts > 0].items():
+            msg = f"必須列 '{name}' に {null_count} 個の空値があります"
+            errors.append(msg)
 
         return errors
 
     def _validate_data_types(self, df: pd.DataFrame) -> list[str]:
-        """データ型の変換可能性チェック."""
+        """データ型の変換可能性チェック. 変換結果は列ごとに破棄する."""
         errors = []
 
         for column_def in self.data_format.columns:
@@ -147,7 +163,7 @@ class DataValidator:
         # 型変換のマッピング
         type_converters = {
             "string": lambda s: s.astype(str),
-            "int": lambda s: pd.to_numeric(s, errors="raise").astype("Int64"),
+            "int": self._convert_to_int,
             "float": lambda s: pd.to_numeric(s, errors="raise"),
         }
 
@@ -163,17 +179,30 @@ class DataValidator:
         msg = f"サポートされていない型: {column_def.type}"
         raise ValueError(msg)
 
+    def _convert_to_int(self, series: pd.Series) -> pd.Series:
+        """整数型(nullable Int64)への変換."""
+        if pd.api.types.is_integer_dtype(series.dtype):
+            # 既に整数型なら数値パースを省略して直接キャスト
+            return series.astype("Int64")
+        return pd.to_numeric(series, errors="raise").astype("Int64")
+
     def _convert_to_bool(self, series: pd.Series) -> pd.Series:
         """ブール型への変換."""
-        if series.dtype == "object":
-            bool_map = {
-                "true": True, "false": False,
-                "True": True, "False": False,
-                "TRUE": True, "FALSE": False,
-                "1": True, "0": False,
-                1: True, 0: False,
-            }
-            return series.map(bool_map).astype(bool)
+        if pd.api.types.is_string_dtype(series.dtype):
+            # object型に加えArrowなどの文字列型も、文字列表現を正規化してから一括判定 ex.) "True", " TRUE ", "1", 1
+            normalized = series.astype("string").str.strip().str.lower()
+            result = normalized.isin(self._TRUE_VALUES)
+            missing = series.isna()
+            invalid = ~(result | normalized.isin(self._FALSE_VALUES) | missing)
+            if invalid.any():
+                # "ture" や "y" などの表記ゆれを False として扱わず、変換エラーとして報告する
+                values = ", ".join(repr(value) for value in series[invalid].unique()[: self._MAX_REPORTED_VALUES])
+                msg = f"真偽値として解釈できない値があります: {values}"
+                raise ValueError(msg)
+            if missing.any():
+                # 欠損値は True に変換せず欠損のまま残す
+                return result.astype("boolean").mask(missing)
+            return result
         return series.astype(bool)
 
     def _convert_to_datetime(self, series: pd.Series, format_str: str | None) -> pd.Series:
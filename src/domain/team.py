@@ -1,6 +1,7 @@
 """Team domain model."""
 import re
 from dataclasses import dataclass
+from typing import ClassVar
 
 
 @dataclass
@@ -11,6 +12,9 @@ class Team:
     name: str
     description: str = ""
 
+    # 末尾の改行を許容しないよう $ ではなく \Z を使用
+    _ID_PATTERN: ClassVar[re.Pattern[str]] = re.compile(r"^[A-Za-z0-9_]+\Z")
+
     def __post_init__(self) -> None:
         """バリデーション."""
         if not self.id:
@@ -23,10 +27,10 @@ class Team:
             msg = "チームIDは英数字とアンダースコアのみ使用可能です"
             raise ValueError(msg)
 
-    @staticmethod
-    def _is_valid_id(team_id: str) -> bool:
+    @classmethod
+    def _is_valid_id(cls, team_id: str) -> bool:
         """チームIDの形式チェック."""
-        return bool(re.match(r"^[a-zA-Z0-9_]+$", team_id))
+        return cls._ID_PATTERN.match(team_id) is not None
 
     def to_dict(self) -> dict:
         """辞書形式に変換."""
@@ -1,9 +1,23 @@
-"""YAML設定ファイルローダー."""
+"""YAML設定ファイルローダー.
+
+読み込んだ設定はキャッシュから同一オブジェクトのまま共有するため、
+dict は MappingProxyType、list は tuple に変換した読み取り専用の形で返す。
+"""
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import yaml
 
+try:
+    # libyaml が利用可能ならCパーサーを使用
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 from src.domain.calculation import CalculationRule, parse_calculation_rules
 from src.domain.team import Team
 
@@ -12,6 +26,14 @@ class ConfigurationError(Exception):
     """設定関連のエラー."""
 
 
+def _freeze_config(value: Any) -> Any:  # noqa: ANN401
+    """YAMLから読み込んだ値を再帰的に読み取り専用の形へ変換."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_config(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_config(item) for item in value)
+    return value
+
 
 class ConfigLoader:
     """設定ファイルローダー."""
@@ -25,6 +47,9 @@ class ConfigLoader:
 
         self.config_dir = Path(config_dir)
         self._validate_config_directory()
+        # 同一ファイルの再パースを避けるための読み込み済みYAMLキャッシュ
+        # ファイルの更新時刻(ns)とサイズを合わせて保持し、どちらかが変わったら読み直す
+        self._yaml_cache: dict[Path, tuple[tuple[int, int], Mapping[str, Any]]] = {}
 
     def _validate_config_directory(self) -> None:
         """設定ディレクトリの存在チェック."""
@@ -36,12 +61,12 @@ class ConfigLoader:
             msg = f"設定パスがディレクトリではありません: {self.config_dir}"
             raise ConfigurationError(msg)
 
-    def load_app_config(self) -> dict[str, Any]:
+    def load_app_config(self) -> Mapping[str, Any]:
         """アプリケーション設定を読み込む."""
         app_config_path = self.config_dir / "app.yaml"
         return self._load_yaml_file(app_config_path, "アプリケーション設定")
 
-    def load_team_config(self, team_id: str) -> dict[str, Any]:
+    def load_team_config(self, team_id: str) -> Mapping[str, Any]:
         """チーム設定を読み込む."""
         team_config_path = self.config_dir / "teams" / f"{team_id}.yaml"
         return self._load_yaml_file(team_config_path, f"チーム設定 ({team_id})")
@@ -50,15 +75,17 @@ class ConfigLoader:
         """利用可能なチーム一覧を取得."""
         teams_dir = self.config_dir / "teams"
 
-        if not teams_dir.exists():
+        # scandir はディレクトリ走査時に取得した種別情報を使うため、ファイルごとのstatが不要
+        try:
+            with os.scandir(teams_dir) as entries:
+                team_ids = [
+                    entry.name.removesuffix(".yaml")
+                    for entry in entries
+                    if entry.name.endswith(".yaml") and entry.is_file()
+                ]
+        except FileNotFoundError as e:
             msg = f"チーム設定ディレクトリが存在しません: {teams_dir}"
-            raise ConfigurationError(msg)
-
-        team_ids = [
-            yaml_file.stem
-            for yaml_file in teams_dir.glob("*.yaml")
-            if yaml_file.is_file()
-        ]
+            raise ConfigurationError(msg) from e
 
         if not team_ids:
             msg = f"チーム設定ファイルが見つかりません: {teams_dir}"
@@ -66,15 +93,27 @@ class ConfigLoader:
 
         return sorted(team_ids)
 
-    def _load_yaml_file(self, file_path: Path, description: str) -> dict[str, Any]:
-        """YAMLファイルを読み込む."""
-        if not file_path.exists():
+    def clear_cache(self) -> None:
+        """読み込み済みYAMLのキャッシュを破棄."""
+        self._yaml_cache.clear()
+
+    def _load_yaml_file(self, file_path: Path, description: str) -> Mapping[str, Any]:
+        """YAMLファイルを読み込み、読み取り専用の設定として返す."""
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError as e:
             msg = f"{description}ファイルが存在しません: {file_path}"
-            raise ConfigurationError(msg)
+            raise ConfigurationError(msg) from e
+
+        # 更新時刻の分解能が粗いファイルシステムでも書き換えを検出できるようサイズも比較
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._yaml_cache.get(file_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
 
         try:
-            with file_path.open("r", encoding="utf-8") as f:
-                content = yaml.safe_load(f)
+            # UTF-8 のデコードは libyaml に任せる
+            content = yaml.load(file_path.read_bytes(), Loader=_SafeLoader)
 
             if content is None:
                 def _raise_empty_file_error() -> None:
@@ -88,7 +127,10 @@ class ConfigLoader:
             msg = f"{description}の読み込みに失敗しました: {file_path} - {e!s}"
             raise ConfigurationError(msg) from e
         else:
-            return content
+            # 呼び出し側で変更されないよう凍結し、キャッシュから同じオブジェクトを返せるようにする
+            frozen = _freeze_config(content)
+            self._yaml_cache[file_path] = (version, frozen)
+            return frozen
 
 
 class TeamConfigManager:
@@ -97,16 +139,17 @@ class TeamConfigManager:
     def __init__(self, config_loader: ConfigLoader | None = None) -> None:
         """チーム設定マネージャーを初期化."""
         self.config_loader = config_loader or ConfigLoader()
+        # team_id -> (解析元の設定, 計算ルール), 設定ファイルが更新されるまで解析結果を再利用する
+        self._rules_cache: dict[str, tuple[Mapping[str, Any], list[CalculationRule]]] = {}
 
     def load_all_teams(self) -> dict[str, Team]:
         """全チーム設定を読み込んでTeamオブジェクトを生成."""
         try:
             team_ids = self.config_loader.get_available_teams()
-            teams = {}
 
-            for team_id in team_ids:
-                team = self.load_team(team_id)
-                teams[team_id] = team
+            # ファイルI/Oが主なのでスレッドで並列に読み込む
+            with ThreadPoolExecutor(max_workers=min(32, len(team_ids))) as executor:
+                teams = dict(zip(team_ids, executor.map(self.load_team, team_ids), strict=True))
         except ConfigurationError:
             # 設定エラーは再スロー
             raise
@@ -116,6 +159,11 @@ class TeamConfigManager:
         else:
             return teams
 
+    def clear_cache(self) -> None:
+        """設定ファイルのキャッシュを破棄."""
+        self.config_loader.clear_cache()
+        self._rules_cache.clear()
+
     def load_team(self, team_id: str) -> Team:
         """指定チームの設定を読み込んでTeamオブジェクトを生成."""
         try:
@@ -139,7 +187,7 @@ class TeamConfigManager:
             msg = f"チーム設定の読み込みに失敗しました ({team_id}): {e!s}"
             raise ConfigurationError(msg) from e
 
-    def load_team_data_format(self, team_id: str) -> dict[str, Any]:
+    def load_team_data_format(self, team_id: str) -> Mapping[str, Any]:
         """チームのデータフォーマット設定を読み込む."""
         try:
             config = self.config_loader.load_team_config(team_id)
@@ -169,8 +217,15 @@ class TeamConfigManager:
                     raise ConfigurationError(msg)
                 _raise_missing_calc_rules()
 
+            # ConfigLoader は未更新のファイルに対して同じ設定オブジェクトを返すため、同一なら前回の解析結果を使う
+            cached = self._rules_cache.get(team_id)
+            if cached is not None and cached[0] is config:
+                return list(cached[1])
+
             # 計算ルールオブジェクトに変換
-            return parse_calculation_rules(config["calculation_rules"])
+            rules = parse_calculation_rules(config["calculation_rules"])
+            self._rules_cache[team_id] = (config, rules)
+            return list(rules)
 
         except ConfigurationError:
             raise
@@ -178,7 +233,7 @@ class TeamConfigManager:
             msg = f"計算ルール設定の読み込みに失敗しました ({team_id}): {e!s}"
             raise ConfigurationError(msg) from e
 
-    def _validate_team_config(self, config: dict[str, Any], team_id: str) -> None:
+    def _validate_team_config(self, config: Mapping[str, Any], team_id: str) -> None:
         """チーム設定の必須フィールドを検証."""
         if "team" not in config:
             msg = f"'team' セクションが見つかりません: {team_id}"
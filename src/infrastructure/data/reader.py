@@ -1,4 +1,11 @@
 """データソースから実データを読み込むリーダー."""
+import contextlib
+import importlib.util
+import os
+import re
+import sys
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -6,11 +13,52 @@ import pandas as pd
 
 from src.infrastructure.config.loader import ConfigLoader
 
+# pyarrow が利用可能なら CSV の読み込みと型に Arrow バックエンドを使用する(NumPy のマスク配列より高速)
+_ARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+if _ARROW_AVAILABLE:
+    _INT_DTYPE, _FLOAT_DTYPE, _STRING_DTYPE = "int64[pyarrow]", "float64[pyarrow]", "string[pyarrow]"
+    # 変換できない値を NaN ではなく欠損値(null)にするため、数値パースも Arrow バックエンドで行う
+    _NUMERIC_OPTIONS: dict[str, Any] = {"dtype_backend": "pyarrow"}
+else:
+    _INT_DTYPE, _FLOAT_DTYPE, _STRING_DTYPE = "Int64", "float64", "string"
+    _NUMERIC_OPTIONS = {}
+
+# free-threaded ビルドでGILが無効な場合のみ列ごとの型変換をスレッドで並列化する
+_GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# 書式指定のない日時列がISO8601形式かどうかの判定用 ex.) 2025-01-01
+_ISO8601_DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# 型名 -> 変換後のdtype, 既にこの型で読み込まれている列は変換を省略する
+_TARGET_DTYPES = {"int": _INT_DTYPE, "float": _FLOAT_DTYPE, "string": _STRING_DTYPE}
+
+# int64 で表せる値の絶対値の上限(比較は浮動小数点で行う)
+_INT64_LIMIT = 2.0**63
+
 
 class DataSourceError(Exception):
     """データソース関連のエラー."""
 
 
+def _advise_sequential_read(fd: int) -> None:
+    """ファイルを先頭から順に読むことをカーネルに通知して先読みを促す(非対応OSでは何もしない).
+
+    あくまでヒントなので、対応していないファイルシステムやパイプで失敗しても読み込みは続ける。
+    """
+    if hasattr(os, "posix_fadvise"):
+        with contextlib.suppress(OSError):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _freeze(value: Any) -> Any:  # noqa: ANN401
+    """dict/list を含む設定値をキャッシュキーに使えるハッシュ可能な形に変換."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 class DataReader:
     """チームごとのデータ読み込みクラス."""
 
@@ -20,12 +68,18 @@ class DataReader:
             project_root = Path(__file__).parent.parent.parent.parent
         self.project_root = project_root
         self._config_loader = ConfigLoader()
+        # 相対パス -> 解決済みの絶対パス, resolve() はパスの各要素をstatするため結果を再利用する
+        self._resolved_paths: dict[str, Path] = {}
+        # (data_source, data_format) -> (データソースのバージョン, 型変換済みDataFrame)
+        self._df_cache: dict[Any, tuple[int, pd.DataFrame]] = {}
 
     def _resolve_path(self, rel_or_abs_path: str) -> Path:
-        p = Path(rel_or_abs_path)
-        if p.is_absolute():
-            return p
-        return (self.project_root / p).resolve()
+        resolved = self._resolved_paths.get(rel_or_abs_path)
+        if resolved is None:
+            p = Path(rel_or_abs_path)
+            resolved = p if p.is_absolute() else (self.project_root / p).resolve()
+            self._resolved_paths[rel_or_abs_path] = resolved
+        return resolved
 
     def load_team_dataframe(self, team_id: str, data_format: dict[str, Any] | None = None) -> pd.DataFrame:
         """チーム設定に基づきデータを読み込む.
@@ -35,52 +89,120 @@ class DataReader:
         """
         config = self._config_loader.load_team_config(team_id)
         data_source = self._validate_and_get_data_source(config, team_id)
-        df = self._load_by_kind(data_source)
+
+        # データソースが更新されていなければ前回の読み込み結果を再利用する
+        cache_key = _freeze((data_source, data_format))
+        version = self._get_source_version(data_source)
+        cached = self._df_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            # 呼び出し側での列の追加・置換がキャッシュに波及しないよう浅いコピーを返す
+            return cached[1].copy(deep=False)
+
+        df = self._load_by_kind(data_source, data_format)
         self._apply_type_conversions(df, data_format)
+        if version is not None:
+            self._df_cache[cache_key] = (version, df)
+            return df.copy(deep=False)
         return df
 
-    def _validate_and_get_data_source(self, config: dict[str, Any], team_id: str) -> dict[str, Any]:
+    def get_source_version(self, team_id: str) -> int | None:
+        """チームのデータソースの更新検知用のバージョンを返す(キャッシュ不可の場合はNone).
+
+        ローカルCSVの場合はファイルの更新時刻(ナノ秒)で、CSVが更新されると値が変わる。
+        """
+        config = self._config_loader.load_team_config(team_id)
+        data_source = self._validate_and_get_data_source(config, team_id)
+        return self._get_source_version(data_source)
+
+    def _get_source_version(self, data_source: Mapping[str, Any]) -> int | None:
+        """データソースの更新検知用のバージョンを返す(キャッシュ不可の場合はNone)."""
+        if data_source.get("kind") == "local_csv":
+            csv_path = self._get_csv_path(data_source)
+            try:
+                return csv_path.stat().st_mtime_ns
+            except FileNotFoundError as e:
+                msg = f"CSVファイルが存在しません: {csv_path}"
+                raise DataSourceError(msg) from e
+        return None
+
+    def _validate_and_get_data_source(self, config: Mapping[str, Any], team_id: str) -> Mapping[str, Any]:
         """データソース設定を検証して返す."""
         if "data_source" not in config:
             msg = f"data_source セクションが見つかりません: {team_id}"
             raise DataSourceError(msg)
         return config["data_source"]
 
-    def _load_by_kind(self, data_source: dict[str, Any]) -> pd.DataFrame:
+    def _load_by_kind(
+        self, data_source: Mapping[str, Any], data_format: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
         """データソースの種類に応じて読み込み処理を振り分ける."""
         kind = data_source.get("kind")
         if kind == "local_csv":
-            return self._load_local_csv(data_source)
+            return self._load_local_csv(data_source, data_format)
         # 将来的な拡張例として、S3やデータベースからの読み込みもここで振り分け可能
         msg = f"未対応のデータソース種類: {kind}"
         raise DataSourceError(msg)
 
-    def _load_local_csv(self, data_source: dict[str, Any]) -> pd.DataFrame:
+    def _load_local_csv(
+        self, data_source: Mapping[str, Any], data_format: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
         """ローカルCSVファイルを読み込む."""
         csv_path = self._get_csv_path(data_source)
-        return self._read_csv(csv_path, data_source.get("options", {}))
+        dtype = self._build_read_dtypes(data_format)
+        return self._read_csv(csv_path, data_source.get("options", {}), dtype)
+
+    def _build_read_dtypes(self, data_format: dict[str, Any] | None) -> dict[str, str]:
+        """CSV読み込み時に指定する列の型を data_format から組み立てる.
+
+        文字列型の列のみ読み込み時に指定する ex.) 先頭が0のコード値を数値として解釈させない。
+        pyarrow エンジンでは dtype が解析後に適用され先頭の0が残らないため、
+        指定がある場合の読み込みは _read_csv でCエンジンに切り替える。
+        数値・日時型は変換できない値を欠損値にするため、読み込み後に変換する。
+        """
+        if not data_format or "columns" not in data_format:
+            return {}
+        return {
+            col_def["name"]: _STRING_DTYPE
+            for col_def in data_format["columns"]
+            if col_def.get("name") and col_def.get("type") == "string"
+        }
 
-    def _get_csv_path(self, data_source: dict[str, Any]) -> Path:
-        """CSVファイルのパスを取得して検証."""
+    def _get_csv_path(self, data_source: Mapping[str, Any]) -> Path:
+        """CSVファイルのパスを取得.
+
+        ファイルの存在は事前に確認せず、実際に stat / open した時点で検出する。
+        """
         path_str = data_source.get("path")
         if not path_str:
             msg = "data_source.path が未設定です"
             raise DataSourceError(msg)
 
-        csv_path = self._resolve_path(path_str)
-        if not csv_path.exists():
-            msg = f"CSVファイルが存在しません: {csv_path}"
-            raise DataSourceError(msg)
-
-        return csv_path
+        return self._resolve_path(path_str)
 
-    def _read_csv(self, csv_path: Path, options: dict[str, Any]) -> pd.DataFrame:
+    def _read_csv(
+        self, csv_path: Path, options: dict[str, Any], dtype: dict[str, str] | None = None,
+    ) -> pd.DataFrame:
         """CSVファイルを読み込む."""
         encoding = options.get("encoding", "utf-8")
         header = 0 if options.get("header", True) else None
 
+        if _ARROW_AVAILABLE and dtype:
+            # pyarrow エンジンは解析後に dtype を適用するため、先頭の0が既に失われている ex.) "007" -> 7
+            # 読み込み時に型を指定する列がある場合は解析時に dtype を反映するCエンジンを使い、型は Arrow バックエンドで受け取る
+            engine_options: dict[str, Any] = {"dtype_backend": "pyarrow"}
+        elif _ARROW_AVAILABLE:
+            # pyarrow のマルチスレッドCSVリーダーを使い、列も Arrow バックエンドの型で受け取る
+            engine_options = {"engine": "pyarrow", "dtype_backend": "pyarrow"}
+        else:
+            engine_options = {}
+
         try:
-            return pd.read_csv(csv_path, encoding=encoding, header=header)
+            with csv_path.open("rb") as f:
+                _advise_sequential_read(f.fileno())
+                return pd.read_csv(f, encoding=encoding, header=header, dtype=dtype, **engine_options)
+        except FileNotFoundError as e:
+            msg = f"CSVファイルが存在しません: {csv_path}"
+            raise DataSourceError(msg) from e
         except Exception as e:
             msg = f"CSV読み込みに失敗しました: {csv_path} - {e!s}"
             raise DataSourceError(msg) from e
@@ -90,26 +212,74 @@ class DataReader:
         if not data_format or "columns" not in data_format:
             return
 
-        for col_def in data_format["columns"]:
-            name = col_def.get("name")
-            col_type = col_def.get("type")
-            if name in df.columns and col_type:
-                self._convert_column_type(df, name, col_type, col_def)
+        tasks = [
+            (col_def["name"], col_def["type"], col_def)
+            for col_def in data_format["columns"]
+            if col_def.get("name") in df.columns and col_def.get("type")
+        ]
+
+        def convert(task: tuple[str, str, dict[str, Any]]) -> pd.Series:
+            name, col_type, col_def = task
+            return self._convert_series(df[name], col_type, col_def)
+
+        if not _GIL_ENABLED and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(tasks))) as executor:
+                results = list(executor.map(convert, tasks))
+        else:
+            results = [convert(task) for task in tasks]
+
+        converted = {
+            name: result
+            for (name, _, _), result in zip(tasks, results, strict=True)
+            if result is not df[name]
+        }
+
+        if converted:
+            # 変換した列は1回の代入でまとめて差し替える
+            df[list(converted)] = pd.DataFrame(converted, index=df.index)
+
+    def _convert_series(
+        self, series: pd.Series, col_type: str, col_def: dict[str, Any],
+    ) -> pd.Series:
+        """単一列の型変換を実行, 変換不要な場合は元の列をそのまま返す.
+
+        解釈できない値は欠損値にする ex.) int列の "abc" や "1.5"。それでも変換できない場合はエラーにする。
+        """
+        # 型変換のマッピング
+        type_converters = {
+            "int": self._convert_to_int,
+            "float": lambda s: pd.to_numeric(s, errors="coerce", **_NUMERIC_OPTIONS).astype(_FLOAT_DTYPE),
+            "datetime": lambda s: self._convert_to_datetime(s, col_def.get("format")),
+            "string": lambda s: s.astype(_STRING_DTYPE),
+        }
+
+        converter = type_converters.get(col_type)
+        if converter is None or series.dtype == _TARGET_DTYPES.get(col_type):
+            return series
 
-    def _convert_column_type(
-        self, df: pd.DataFrame, name: str, col_type: str, col_def: dict[str, Any],
-    ) -> None:
-        """単一列の型変換を実行."""
         try:
-            if col_type == "int":
-                df[name] = pd.to_numeric(df[name], errors="coerce").astype("Int64")
-            elif col_type == "float":
-                df[name] = pd.to_numeric(df[name], errors="coerce")
-            elif col_type == "datetime":
-                fmt = col_def.get("format")
-                df[name] = pd.to_datetime(df[name], format=fmt, errors="coerce")
-            elif col_type == "string":
-                df[name] = df[name].astype("string")
-        except Exception:  # noqa: BLE001, S110
-            # 型変換失敗時はcoerce結果をそのまま利用
-            pass
+            return converter(series)
+        except Exception as e:
+            msg = f"列 '{series.name}' を {col_type} 型に変換できません: {e!s}"
+            raise DataSourceError(msg) from e
+
+    def _convert_to_int(self, series: pd.Series) -> pd.Series:
+        """整数型へ変換する, 数値として解釈できない値と整数でない値は欠損値にする."""
+        numeric = pd.to_numeric(series, errors="coerce", **_NUMERIC_OPTIONS)
+        if not pd.api.types.is_integer_dtype(numeric.dtype):
+            # 小数や無限大、int64 の範囲外の値を含むと整数型へキャストできないため除外する
+            numeric = numeric.where(numeric.round().eq(numeric) & numeric.abs().lt(_INT64_LIMIT))
+        return numeric.astype(_INT_DTYPE)
+
+    def _convert_to_datetime(self, series: pd.Series, fmt: str | None) -> pd.Series:
+        """日時型へ変換する.
+
+        書式の指定がなく値がISO8601形式の場合は、要素ごとの書式推定を行わない高速な経路で解析する。
+        """
+        if fmt is None:
+            first_index = series.first_valid_index()
+            if first_index is not None:
+                first_value = series.loc[first_index]
+                if isinstance(first_value, str) and _ISO8601_DATE_PATTERN.match(first_value):
+                    fmt = "ISO8601"
+        return pd.to_datetime(series, format=fmt, errors="coerce")
@@ -1,21 +1,71 @@
 """Main Streamlit application."""
+from dataclasses import fields
+
 import pandas as pd
 import streamlit as st
 
+from src.domain.calculation import CalculationRule
+from src.domain.data_format import ColumnDefinition
+from src.infrastructure.config.loader import TeamConfigManager
+from src.infrastructure.data.reader import DataReader
 from src.presentation.team_manager import TeamManager
 
+# 列定義の表示列, 設定で省略された項目も空欄として同じ順序で表示する
+COLUMN_DEFINITION_FIELDS = [field.name for field in fields(ColumnDefinition)]
+
 st.set_page_config(
     page_title="Excel DX 設定管理",
     page_icon="📊",
     layout="wide",
 )
 
+
+@st.cache_resource
+def get_config_manager() -> TeamConfigManager:
+    """全セッションで共有する設定マネージャー(YAMLの解析結果をセッション間で再利用)."""
+    return TeamConfigManager()
+
+
+@st.cache_resource
+def get_data_reader() -> DataReader:
+    """全セッションで共有するデータリーダー(CSVの読み込み結果をセッション間で再利用)."""
+    return DataReader()
+
+
+def format_rule_markdown(rule: CalculationRule) -> str:
+    """計算ルール1件分の表示用Markdownを組み立てる."""
+    blocks = [f"**{rule.name}**", f"```python\n{rule.formula}\n```"]
+    if rule.description:
+        blocks.append(rule.description)
+    if rule.group_by:
+        blocks.append("グループ化: " + ", ".join(f"`{col}`" for col in rule.group_by))
+    return "\n\n".join(blocks)
+
+
 # TeamManagerの初期化
+# 作成したチームはセッションごとに保持し、設定・データの読み込みのみ共有する
 if "team_manager" not in st.session_state:
-    st.session_state.team_manager = TeamManager()
+    st.session_state.team_manager = TeamManager(get_config_manager(), get_data_reader())
 
 manager = st.session_state.team_manager
 
+
+@st.cache_data(ttl=300, max_entries=8)
+def compute_with_rules_cached(
+    _manager: TeamManager,
+    _df: pd.DataFrame,
+    team_id: str,
+    data_version: int,  # noqa: ARG001 キャッシュキーとしてのみ使用
+    rules: tuple[CalculationRule, ...],
+) -> pd.DataFrame | None:
+    """計算結果をキャッシュして再実行時の再計算を避ける.
+
+    DataFrame はハッシュせず、チームID・データソースのバージョン(CSVの更新時刻)・計算ルールをキャッシュキーとする。
+    CSVが更新されるとバージョンが、設定ファイルの計算ルールが更新されるとルールが変わり再計算される。
+    """
+    return _manager.compute_with_rules(team_id, _df, rules)
+
+
 # 設定エラーがある場合の警告表示
 if manager.has_config_error():
     st.error(f"⚠️ 設定エラー: {manager.get_config_error()}")
@@ -26,9 +76,8 @@ if manager.has_config_error():
 # サイドバー
 st.sidebar.title("🏢 チーム選択")
 
-teams = manager.get_all_teams()
-if teams:
-    team_options = {tid: team.name for tid, team in teams.items()}
+team_options = manager.get_team_options()
+if team_options:
     selected_team_id = st.sidebar.selectbox(
         "チームを選択",
         options=list(team_options.keys()),
@@ -39,6 +88,8 @@ else:
     selected_team_id = None
     st.sidebar.info("チームが登録されていません")
 
+current_team = manager.get_team(selected_team_id) if selected_team_id else None
+
 if st.sidebar.button("+ 新規チーム作成", key="create_team_button"):
     st.session_state.show_create_form = True
 
@@ -93,7 +144,7 @@ with tab1:
                 st.rerun()
 
     elif selected_team_id:
-        team = manager.get_team(selected_team_id)
+        team = current_team
         st.header(f"📋 {team.name}")
 
         if team.description:
@@ -108,7 +159,7 @@ with tab1:
 with tab2:
     st.header("📊 データフォーマット設定")
     if selected_team_id:
-        team = manager.get_team(selected_team_id)
+        team = current_team
         st.info(f"チーム: {team.name}")
 
         # データフォーマット設定の表示
@@ -117,7 +168,9 @@ with tab2:
             st.subheader("CSV列定義")
 
             if "columns" in data_format_config:
-                columns_df = pd.DataFrame(data_format_config["columns"])
+                columns_df = pd.DataFrame.from_records(
+                    data_format_config["columns"], columns=COLUMN_DEFINITION_FIELDS,
+                )
                 st.dataframe(columns_df, width="stretch")
 
                 # 列定義の詳細表示
@@ -140,7 +193,7 @@ with tab2:
 with tab3:
     st.header("🧮 計算ルール設定")
     if selected_team_id:
-        team = manager.get_team(selected_team_id)
+        team = current_team
         st.info(f"チーム: {team.name}")
 
         # 計算ルール設定の表示
@@ -148,23 +201,8 @@ with tab3:
         if calculation_rules:
             st.subheader("計算式一覧")
 
-            for i, rule in enumerate(calculation_rules):
-                with st.container():
-                    col1, col2 = st.columns([1, 3])
-
-                    with col1:
-                        st.markdown(f"**{rule.name}**")
-                        st.code(rule.formula, language="python")
-
-                    with col2:
-                        if rule.description:
-                            st.markdown(rule.description)
-
-                        if rule.group_by:
-                            st.caption(f"グループ化: {', '.join(rule.group_by)}")
-
-                    if i < len(calculation_rules) - 1:
-                        st.divider()
+            # ルールごとにStreamlitの要素を並べず、1つのMarkdownとしてまとめて描画する
+            st.markdown("\n\n---\n\n".join(format_rule_markdown(rule) for rule in calculation_rules))
         else:
             st.warning("計算ルール設定が読み込めませんでした")
     else:
@@ -173,9 +211,11 @@ with tab3:
 with tab4:
     st.header("📈 データ読み込みと計算結果")
     if selected_team_id:
-        team = manager.get_team(selected_team_id)
+        team = current_team
         st.info(f"チーム: {team.name}")
 
+        # 読み込み中にCSVが更新された場合に古い結果を新しいバージョンで保持しないよう、先にバージョンを取得する
+        data_version = manager.get_team_data_version(selected_team_id)
         df = manager.load_team_data(selected_team_id)
         if df is None:
             st.warning("データの読み込みに失敗しました。設定を確認してください。")
@@ -183,7 +223,12 @@ with tab4:
             st.subheader("元データ")
             st.dataframe(df, use_container_width=True)
 
-            computed = manager.compute_with_rules(selected_team_id, df)
+            rules = tuple(manager.get_team_calculation_rules(selected_team_id) or ())
+            if data_version is None:
+                # 更新を検知できないデータソースはキャッシュしない
+                computed = manager.compute_with_rules(selected_team_id, df, rules)
+            else:
+                computed = compute_with_rules_cached(manager, df, selected_team_id, data_version, rules)
             st.subheader("計算結果")
             st.dataframe(computed, use_container_width=True)
     else:
@@ -1,7 +1,10 @@
 """Team manager for session state abstraction."""
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+
 import pandas as pd
 
-from src.domain.calculation import CalculationEngine
+from src.domain.calculation import CalculationEngine, CalculationRule
 from src.domain.team import Team
 from src.infrastructure.config.loader import ConfigurationError, TeamConfigManager
 from src.infrastructure.data.reader import DataReader, DataSourceError
@@ -10,17 +13,27 @@ from src.infrastructure.data.reader import DataReader, DataSourceError
 class TeamManager:
     """チーム管理クラス(セッション状態の抽象化)."""
 
-    def __init__(self) -> None:
-        """Initialize team manager."""
+    def __init__(
+        self,
+        config_manager: TeamConfigManager | None = None,
+        data_reader: DataReader | None = None,
+    ) -> None:
+        """Initialize team manager.
+
+        config_manager / data_reader を渡すと、読み込み結果のキャッシュを複数のマネージャーで共有できる。
+        """
         self._teams: dict[str, Team] = {}
-        self._config_manager = TeamConfigManager()
+        # チームID -> チーム名 の選択肢, チームの追加・削除・再読み込み時に破棄する
+        self._team_options: dict[str, str] | None = None
+        self._config_manager = config_manager or TeamConfigManager()
         self._config_error: str | None = None
-        self._data_reader = DataReader()
+        self._data_reader = data_reader or DataReader()
         self._calc_engine = CalculationEngine()
         self._load_teams_from_config()
 
     def _load_teams_from_config(self) -> None:
         """設定ファイルからチームを読み込む."""
+        self._team_options = None
         try:
             self._teams = self._config_manager.load_all_teams()
             self._config_error = None
@@ -28,9 +41,15 @@ class TeamManager:
             self._config_error = str(e)
             self._teams = {}
 
-    def get_all_teams(self) -> dict[str, Team]:
-        """全チームを取得."""
-        return self._teams.copy()
+    def get_all_teams(self) -> Mapping[str, Team]:
+        """全チームを取得(コピーせず読み取り専用のビューを返す)."""
+        return MappingProxyType(self._teams)
+
+    def get_team_options(self) -> Mapping[str, str]:
+        """チーム選択用の チームID -> チーム名 を取得."""
+        if self._team_options is None:
+            self._team_options = {tid: team.name for tid, team in self._teams.items()}
+        return MappingProxyType(self._team_options)
 
     def get_team(self, team_id: str) -> Team | None:
         """指定したチームを取得."""
@@ -44,12 +63,14 @@ class TeamManager:
 
         team = Team(id=team_id, name=name, description=description)
         self._teams[team_id] = team
+        self._team_options = None
         return team
 
     def delete_team(self, team_id: str) -> bool:
         """チームを削除."""
         if team_id in self._teams:
             del self._teams[team_id]
+            self._team_options = None
             return True
         return False
 
@@ -71,9 +92,10 @@ class TeamManager:
 
     def reload_config(self) -> None:
         """設定ファイルを再読み込み."""
+        self._config_manager.clear_cache()
         self._load_teams_from_config()
 
-    def get_team_data_format(self, team_id: str) -> dict | None:
+    def get_team_data_format(self, team_id: str) -> Mapping | None:
         """チームのデータフォーマット設定を取得."""
         try:
             return self._config_manager.load_team_data_format(team_id)
@@ -95,11 +117,27 @@ class TeamManager:
         except (ConfigurationError, DataSourceError):
             return None
 
-    def compute_with_rules(self, team_id: str, df: pd.DataFrame | None) -> pd.DataFrame | None:
-        """読み込んだデータに計算ルールを適用したDataFrameを返す."""
+    def get_team_data_version(self, team_id: str) -> int | None:
+        """チームのデータソースのバージョンを取得(取得できない場合はNone)."""
+        try:
+            return self._data_reader.get_source_version(team_id)
+        except (ConfigurationError, DataSourceError):
+            return None
+
+    def compute_with_rules(
+        self,
+        team_id: str,
+        df: pd.DataFrame | None,
+        rules: Sequence[CalculationRule] | None = None,
+    ) -> pd.DataFrame | None:
+        """読み込んだデータに計算ルールを適用したDataFrameを返す.
+
+        rules を省略した場合はチームの設定から計算ルールを読み込む。
+        """
         if df is None:
             return None
-        rules = self.get_team_calculation_rules(team_id) or []
+        if rules is None:
+            rules = self.get_team_calculation_rules(team_id) or []
         try:
             return self._calc_engine.apply_multiple_rules(df, rules)
         except Exception:  # noqa: BLE001
@@ -0,0 +1,23 @@
+"""テスト全体で共通の設定."""
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """コマンドラインオプションを追加."""
+    parser.addoption(
+        "--run-slow",
+        action="store_true",
+        default=False,
+        help="大きなデータを使う slow マーカー付きのテストも実行する",
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """--run-slow が指定されていない場合、slow マーカー付きのテストをスキップ."""
+    if config.getoption("--run-slow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="--run-slow を指定した場合のみ実行")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
@@ -1,12 +1,33 @@
 """E2Eテスト用の設定ファイル."""
+import os
+from collections.abc import Iterator
+
 import pytest
 from playwright.sync_api import Browser, BrowserContext, Page, Playwright
 
+BASE_URL = os.getenv("E2E_BASE_URL", "http://localhost:8501")
+
+# コンテナ/CI環境での起動を軽くするためのChromium起動オプション
+BROWSER_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+
+def _sandbox_disabled() -> bool:
+    """Chromiumのサンドボックスを無効化するかを返す.
+
+    E2E_NO_SANDBOX で明示でき、未設定の場合はサンドボックスを起動できない root 実行時 ex.) コンテナ のみ無効化する。
+    """
+    flag = os.getenv("E2E_NO_SANDBOX")
+    if flag is not None:
+        return flag.lower() == "true"
+    return hasattr(os, "geteuid") and os.geteuid() == 0
+
 
 @pytest.fixture(scope="session")
 def browser(playwright: Playwright) -> Browser:
     """ブラウザセッションを開始."""
-    return playwright.chromium.launch()
+    headless = os.getenv("E2E_HEADLESS", "true").lower() != "false"
+    args = [*BROWSER_ARGS, "--no-sandbox"] if _sandbox_disabled() else BROWSER_ARGS
+    return playwright.chromium.launch(headless=headless, args=args)
 
 
 @pytest.fixture(scope="session")
@@ -15,7 +36,26 @@ def context(browser: Browser) -> BrowserContext:
     return browser.new_context()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def page(context: BrowserContext) -> Page:
-    """ページを作成."""
+    """ページを作成(全テストで共有し、テストごとのページ生成を避ける)."""
     return context.new_page()
+
+
+@pytest.fixture(autouse=True)
+def _reset_page(page: Page) -> Iterator[None]:
+    """各テストをアプリの初期表示から開始し、テスト後にCookieとlocalStorageを消去.
+
+    既にアプリを表示している場合は再読み込みのみ行い、Streamlitのセッションを作り直す。
+    """
+    if page.url.rstrip("/") == BASE_URL.rstrip("/"):
+        page.reload()
+    else:
+        page.goto(BASE_URL)
+    page.wait_for_selector('[data-testid="stSidebar"]')
+
+    yield
+    page.context.clear_cookies()
+    # about:blank など http(s) 以外のページでは localStorage にアクセスできない
+    if page.url.startswith("http"):
+        page.evaluate("() => window.localStorage.clear()")
@@ -0,0 +1,88 @@
+"""ドメイン層のユニットテスト用の共通フィクスチャ.
+
+セッション内で共有するため、フィクスチャの返す値はテストで変更しないこと。
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.domain.data_format import ColumnDefinition, DataFormat, DataValidator
+
+# slow マーカー付きテストで使う大きなDataFrameの行数
+LARGE_ROW_COUNT = 500_000
+
+
+@pytest.fixture(scope="session")
+def validator() -> DataValidator:
+    """サンプルDataFrameの列定義を持つDataValidatorを作成.
+
+    列定義は validator.data_format から参照できる。
+    """
+    return DataValidator(DataFormat(columns=[
+        ColumnDefinition(name="name", type="string", required=True),
+        ColumnDefinition(name="age", type="int", required=True),
+        ColumnDefinition(name="salary", type="float", required=False, default=0.0),
+        ColumnDefinition(name="active", type="bool", required=False, default=True),
+    ]))
+
+
+@pytest.fixture(scope="session")
+def valid_df() -> pd.DataFrame:
+    """列定義を満たすDataFrame."""
+    return pd.DataFrame({
+        "name": ["Alice", "Bob", "Charlie"],
+        "age": [25, 30, 35],
+        "salary": [50000.0, 60000.0, 70000.0],
+        "active": [True, False, True],
+    })
+
+
+@pytest.fixture(scope="session")
+def missing_col_df() -> pd.DataFrame:
+    """必須列 age が不足しているDataFrame."""
+    return pd.DataFrame({
+        "name": ["Alice", "Bob"],
+        "salary": [50000.0, 60000.0],
+    })
+
+
+@pytest.fixture(scope="session")
+def null_values_df() -> pd.DataFrame:
+    """必須列に空値を含むDataFrame."""
+    return pd.DataFrame({
+        "name": ["Alice", None, "Charlie"],
+        "age": [25, 30, None],
+        "salary": [50000.0, 60000.0, 70000.0],
+    })
+
+
+@pytest.fixture(scope="session")
+def convert_types_df() -> pd.DataFrame:
+    """型変換前の文字列で表現されたDataFrame.
+
+    CSV読み込み直後と同じく全列を object 型で作成し、列ごとの型推論を省く。
+    """
+    return pd.DataFrame({
+        "name": ["Alice", "Bob", "Charlie"],
+        "age": ["25", "30", "35"],  # 文字列として入力
+        "salary": ["50000.0", "60000.0", None],  # 文字列とNull
+        "active": ["true", "false", "1"],  # 文字列のboolean
+    }, dtype=object)
+
+
+@pytest.fixture(scope="session")
+def converted_df(validator: DataValidator, convert_types_df: pd.DataFrame) -> pd.DataFrame:
+    """convert_types_df を型変換したDataFrame(変換は1回だけ行う)."""
+    return validator.convert_dataframe(convert_types_df)
+
+
+@pytest.fixture(scope="session")
+def large_df() -> pd.DataFrame:
+    """列定義を満たす大きなDataFrame(slow マーカー付きテスト用)."""
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "name": rng.choice(["Alice", "Bob", "Charlie"], LARGE_ROW_COUNT),
+        "age": rng.integers(0, 100, LARGE_ROW_COUNT),
+        "salary": rng.uniform(0, 100_000, LARGE_ROW_COUNT),
+        "active": rng.choice([True, False], LARGE_ROW_COUNT),
+    })
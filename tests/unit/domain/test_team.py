@@ -1,9 +1,13 @@
 """Unit tests for the Team entity."""
 
+import re
+
 import pytest
 
 from src.domain.team import Team
 
+INVALID_ID_ERROR = re.compile("英数字とアンダースコアのみ")
+
 
 class TestTeam:
     """Teamエンティティのユニットテスト."""
@@ -12,26 +16,15 @@ class TestTeam:
         """Test that Team can be created successfully with all parameters."""
         team = Team(id="team_a", name="チームA", description="説明A")
 
-        if team.id != "team_a":
-            msg = f"Expected team.id to be 'team_a', got {team.id}"
-            raise AssertionError(msg)
-        if team.name != "チームA":
-            msg = f"Expected team.name to be 'チームA', got {team.name}"
-            raise AssertionError(msg)
-        if team.description != "説明A":
-            msg = f"Expected team.description to be '説明A', got {team.description}"
-            raise AssertionError(msg)
+        assert team.id == "team_a"
+        assert team.name == "チームA"
+        assert team.description == "説明A"
 
     def test_description_is_optional(self) -> None:
         """Test that description parameter is optional when creating Team."""
         team = Team(id="team_a", name="チームA")
 
-        if team.description != "":
-            msg = (
-                f"Expected team.description to be empty string, "
-                f"got {team.description}"
-            )
-            raise AssertionError(msg)
+        assert team.description == ""
 
     def test_empty_id_raises_error(self) -> None:
         """Test that empty ID raises ValueError."""
@@ -43,16 +36,19 @@ class TestTeam:
         with pytest.raises(ValueError, match="チーム名は必須です"):
             Team(id="team_a", name="")
 
-    def test_invalid_id_characters_raise_error(self) -> None:
+    @pytest.mark.parametrize(
+        "invalid_id",
+        [
+            "team-a",  # ハイフンは不可
+            "チームA",  # 日本語は不可
+            "team a",  # スペースは不可
+            "team_a\n",  # 末尾の改行は不可
+        ],
+    )
+    def test_invalid_id_characters_raise_error(self, invalid_id: str) -> None:
         """Test that invalid characters in ID raise ValueError."""
-        with pytest.raises(ValueError, match="英数字とアンダースコアのみ"):
-            Team(id="team-a", name="チームA")  # ハイフンは不可
-
-        with pytest.raises(ValueError, match="英数字とアンダースコアのみ"):
-            Team(id="チームA", name="チームA")  # 日本語は不可
-
-        with pytest.raises(ValueError, match="英数字とアンダースコアのみ"):
-            Team(id="team a", name="チームA")  # スペースは不可
+        with pytest.raises(ValueError, match=INVALID_ID_ERROR):
+            Team(id=invalid_id, name="チームA")
 
     def test_convert_to_dict(self) -> None:
         """Test that Team can be converted to dictionary."""
@@ -64,9 +60,7 @@ class TestTeam:
             "name": "チームA",
             "description": "説明A",
         }
-        if data != expected_data:
-            msg = f"Expected {expected_data}, got {data}"
-            raise AssertionError(msg)
+        assert data == expected_data
 
     def test_restore_from_dict(self) -> None:
         """Test that Team can be restored from dictionary."""
@@ -77,15 +71,9 @@ class TestTeam:
         }
         team = Team.from_dict(data)
 
-        if team.id != "team_b":
-            msg = f"Expected team.id to be 'team_b', got {team.id}"
-            raise AssertionError(msg)
-        if team.name != "チームB":
-            msg = f"Expected team.name to be 'チームB', got {team.name}"
-            raise AssertionError(msg)
-        if team.description != "説明B":
-            msg = f"Expected team.description to be '説明B', got {team.description}"
-            raise AssertionError(msg)
+        assert team.id == "team_b"
+        assert team.name == "チームB"
+        assert team.description == "説明B"
 
     def test_restore_from_dict_without_description(self) -> None:
         """Test that Team can be restored from dictionary without description."""
@@ -95,10 +83,4 @@ class TestTeam:
         }
         team = Team.from_dict(data)
 
-        if team.description != "":
-            msg = (
-                f"Expected team.description to be empty string, "
-                f"got {team.description}"
-            )
-            raise AssertionError(msg)
-
+        assert team.description == ""
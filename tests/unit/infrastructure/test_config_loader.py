@@ -1,9 +1,11 @@
 """Unit tests for the configuration loader."""
 
+import os
+import re
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
-import yaml
 
 from src.infrastructure.config.loader import (
     ConfigLoader,
@@ -11,6 +13,38 @@ from src.infrastructure.config.loader import (
     TeamConfigManager,
 )
 
+# pytest.raises の match に渡すエラーメッセージのパターン
+CONFIG_DIR_NOT_FOUND_ERROR = re.compile("設定ディレクトリが存在しません")
+CONFIG_PATH_NOT_DIR_ERROR = re.compile("設定パスがディレクトリではありません")
+APP_CONFIG_NOT_FOUND_ERROR = re.compile("アプリケーション設定ファイルが存在しません")
+FILE_NOT_FOUND_ERROR = re.compile("ファイルが存在しません")
+TEAMS_DIR_NOT_FOUND_ERROR = re.compile("チーム設定ディレクトリが存在しません")
+NO_TEAM_FILES_ERROR = re.compile("チーム設定ファイルが見つかりません")
+YAML_SYNTAX_ERROR = re.compile("YAML 構文エラー")
+EMPTY_FILE_ERROR = re.compile("ファイルが空または不正です")
+LOAD_FAILED_ERROR = re.compile("読み込みに失敗しました")
+MISSING_TEAM_SECTION_ERROR = re.compile("'team' セクションが見つかりません")
+TEAM_ID_MISMATCH_ERROR = re.compile("チームIDとファイル名が一致しません")
+MISSING_DATA_FORMAT_ERROR = re.compile("データフォーマット設定が見つかりません")
+MISSING_CALCULATION_RULES_ERROR = re.compile("計算ルール設定が見つかりません")
+MISSING_REQUIRED_FIELD_ERROR = re.compile("必須フィールドが不足または空です")
+MISSING_TEAM_ID_ERROR = re.compile("必須フィールドが不足または空です: team.id")
+MISSING_TEAM_NAME_ERROR = re.compile("必須フィールドが不足または空です: team.name")
+
+# チーム設定テスト用に書き出すYAML
+_TEAM_A_YAML = "team:\n  id: team_a\n  name: 営業チームA\n  description: テスト用チーム\n"
+_TEAM_A_ONLY_YAML = "team:\n  id: team_a\n  name: チームA\n"
+_TEAM_B_YAML = "team:\n  id: team_b\n  name: チームB\n"
+_NO_TEAM_SECTION_YAML = "other_section:\n  data: value\n"
+_TEAM_A_DATA_FORMAT_YAML = (
+    _TEAM_A_ONLY_YAML
+    + "data_format:\n  columns:\n  - name: col1\n    type: string\n    required: true\n"
+)
+_TEAM_A_CALCULATION_RULES_YAML = (
+    _TEAM_A_ONLY_YAML
+    + "calculation_rules:\n- name: test_rule\n  formula: a + b\n  description: テストルール\n"
+)
+
 
 class TestConfigLoader:
     """ConfigLoaderのユニットテスト."""
@@ -36,61 +70,83 @@ class TestConfigLoader:
         """既存のディレクトリでConfigLoaderが正常に作成できることをテスト."""
         loader = ConfigLoader(temp_config_dir)
 
-        if loader.config_dir != temp_config_dir:
-            msg = f"Expected config_dir to be {temp_config_dir}, got {loader.config_dir}"
-            raise AssertionError(msg)
+        assert loader.config_dir == temp_config_dir
 
     def test_create_config_loader_with_nonexistent_directory(self) -> None:
         """存在しないディレクトリでエラーが発生することをテスト."""
         nonexistent_path = Path("/nonexistent/path")
 
-        with pytest.raises(ConfigurationError, match="設定ディレクトリが存在しません"):
+        with pytest.raises(ConfigurationError, match=CONFIG_DIR_NOT_FOUND_ERROR):
             ConfigLoader(nonexistent_path)
 
     def test_load_app_config_success(self, config_loader: ConfigLoader, temp_config_dir: Path) -> None:
         """アプリケーション設定の正常読み込みテスト."""
         # app.yamlファイルを作成
-        app_config_content = {
-            "app": {
-                "name": "Test App",
-                "version": "1.0.0",
-            },
-        }
         app_config_path = temp_config_dir / "app.yaml"
-        with app_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(app_config_content, f)
+        app_config_path.write_text("app:\n  name: Test App\n  version: 1.0.0\n", encoding="utf-8")
 
         config = config_loader.load_app_config()
 
-        if config["app"]["name"] != "Test App":
-            msg = f"Expected app name 'Test App', got {config['app']['name']}"
-            raise AssertionError(msg)
+        assert config["app"]["name"] == "Test App"
 
     def test_load_app_config_file_not_found(self, config_loader: ConfigLoader) -> None:
         """app.yamlが存在しない場合のエラーテスト."""
-        with pytest.raises(ConfigurationError, match="アプリケーション設定ファイルが存在しません"):
+        with pytest.raises(ConfigurationError, match=APP_CONFIG_NOT_FOUND_ERROR):
             config_loader.load_app_config()
 
     def test_load_team_config_success(self, config_loader: ConfigLoader, temp_config_dir: Path) -> None:
         """チーム設定の正常読み込みテスト."""
         # team_a.yamlファイルを作成
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "Team A",
-                "description": "Test team",
-            },
-        }
         teams_dir = temp_config_dir / "teams"
         team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        team_config_path.write_text("team:\n  id: team_a\n  name: Team A\n  description: Test team\n", encoding="utf-8")
+
+        config = config_loader.load_team_config("team_a")
+
+        assert config["team"]["id"] == "team_a"
+
+    def test_load_team_config_uses_cache(self, config_loader: ConfigLoader, temp_config_dir: Path) -> None:
+        """未更新のファイルはキャッシュから返し、更新されたら再読み込みすることをテスト."""
+        team_config_path = temp_config_dir / "teams" / "team_a.yaml"
+        team_config_path.write_text("team:\n  id: team_a\n  name: Team A\n", encoding="utf-8")
+
+        first = config_loader.load_team_config("team_a")
+        assert config_loader.load_team_config("team_a") is first
+
+        mtime_ns = team_config_path.stat().st_mtime_ns
+        team_config_path.write_text("team:\n  id: team_a\n  name: Updated\n", encoding="utf-8")
+        # 更新時刻の分解能に依存しないよう明示的に進める
+        os.utime(team_config_path, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+
+        reloaded = config_loader.load_team_config("team_a")
+        assert reloaded["team"]["name"] == "Updated"
+
+    def test_load_team_config_reloads_when_size_changes(
+        self, config_loader: ConfigLoader, temp_config_dir: Path,
+    ) -> None:
+        """更新時刻が変わらなくてもファイルサイズが変われば再読み込みすることをテスト."""
+        team_config_path = temp_config_dir / "teams" / "team_a.yaml"
+        team_config_path.write_text("team:\n  id: team_a\n  name: Team A\n", encoding="utf-8")
+        mtime_ns = team_config_path.stat().st_mtime_ns
+        config_loader.load_team_config("team_a")
+
+        team_config_path.write_text("team:\n  id: team_a\n  name: Renamed Team A\n", encoding="utf-8")
+        os.utime(team_config_path, ns=(mtime_ns, mtime_ns))
+
+        assert config_loader.load_team_config("team_a")["team"]["name"] == "Renamed Team A"
+
+    def test_load_team_config_returns_read_only_config(
+        self, config_loader: ConfigLoader, temp_config_dir: Path,
+    ) -> None:
+        """キャッシュで共有される設定が呼び出し側から変更できないことをテスト."""
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_CALCULATION_RULES_YAML, encoding="utf-8")
 
         config = config_loader.load_team_config("team_a")
 
-        if config["team"]["id"] != "team_a":
-            msg = f"Expected team id 'team_a', got {config['team']['id']}"
-            raise AssertionError(msg)
+        assert isinstance(config["calculation_rules"], tuple)
+        with pytest.raises(TypeError):
+            config["team"]["name"] = "Changed"  # type: ignore[index]
+        assert config_loader.load_team_config("team_a")["team"]["name"] == "チームA"
 
     def test_get_available_teams(self, config_loader: ConfigLoader, temp_config_dir: Path) -> None:
         """利用可能チーム一覧の取得テスト."""
@@ -99,30 +155,25 @@ class TestConfigLoader:
         # 複数のチーム設定ファイルを作成
         for team_id in ["team_a", "team_b", "team_c"]:
             team_config_path = teams_dir / f"{team_id}.yaml"
-            team_config_content = {"team": {"id": team_id, "name": f"Team {team_id.upper()}"}}
-            with team_config_path.open("w", encoding="utf-8") as f:
-                yaml.dump(team_config_content, f)
+            team_config_path.write_text(f"team:\n  id: {team_id}\n  name: Team {team_id.upper()}\n", encoding="utf-8")
 
         team_ids = config_loader.get_available_teams()
 
         expected_teams = ["team_a", "team_b", "team_c"]
-        if sorted(team_ids) != sorted(expected_teams):
-            msg = f"Expected teams {expected_teams}, got {team_ids}"
-            raise AssertionError(msg)
+        assert sorted(team_ids) == sorted(expected_teams)
 
     def test_get_available_teams_empty_directory(self, config_loader: ConfigLoader) -> None:
         """チーム設定ファイルが存在しない場合のエラーテスト."""
-        with pytest.raises(ConfigurationError, match="チーム設定ファイルが見つかりません"):
+        with pytest.raises(ConfigurationError, match=NO_TEAM_FILES_ERROR):
             config_loader.get_available_teams()
 
     def test_load_yaml_file_with_invalid_syntax(self, config_loader: ConfigLoader, temp_config_dir: Path) -> None:
         """不正なYAML構文の場合のエラーテスト."""
         # 不正なYAMLファイルを作成
         invalid_yaml_path = temp_config_dir / "app.yaml"
-        with invalid_yaml_path.open("w", encoding="utf-8") as f:
-            f.write("invalid: yaml: content: [")
+        invalid_yaml_path.write_text("invalid: yaml: content: [", encoding="utf-8")
 
-        with pytest.raises(ConfigurationError, match="YAML 構文エラー"):
+        with pytest.raises(ConfigurationError, match=YAML_SYNTAX_ERROR):
             config_loader.load_app_config()
 
 
@@ -148,152 +199,73 @@ class TestTeamConfigManager:
 
     def test_load_team_success(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """チーム設定の正常読み込みとTeamオブジェクト生成テスト."""
-        # team_a.yamlファイルを作成
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "営業チームA",
-                "description": "テスト用チーム",
-            },
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_YAML, encoding="utf-8")
 
         team = team_config_manager.load_team("team_a")
 
-        if team.id != "team_a":
-            msg = f"Expected team id 'team_a', got {team.id}"
-            raise AssertionError(msg)
-        if team.name != "営業チームA":
-            msg = f"Expected team name '営業チームA', got {team.name}"
-            raise AssertionError(msg)
-        if team.description != "テスト用チーム":
-            msg = f"Expected team description 'テスト用チーム', got {team.description}"
-            raise AssertionError(msg)
+        assert team.id == "team_a"
+        assert team.name == "営業チームA"
+        assert team.description == "テスト用チーム"
 
     def test_load_team_missing_team_section(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """teamセクションが不足している場合のエラーテスト."""
-        # teamセクションのないYAMLファイルを作成
-        team_config_content = {
-            "other_section": {
-                "data": "value",
-            },
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_NO_TEAM_SECTION_YAML, encoding="utf-8")
 
-        with pytest.raises(ConfigurationError, match="'team' セクションが見つかりません"):
+        with pytest.raises(ConfigurationError, match=MISSING_TEAM_SECTION_ERROR):
             team_config_manager.load_team("team_a")
 
     def test_load_team_id_mismatch(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """チームIDとファイル名が一致しない場合のエラーテスト."""
         # team_a.yamlにteam_bの設定を記述
-        team_config_content = {
-            "team": {
-                "id": "team_b",  # ファイル名と異なる
-                "name": "チームB",
-            },
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_B_YAML, encoding="utf-8")
 
-        with pytest.raises(ConfigurationError, match="チームIDとファイル名が一致しません"):
+        with pytest.raises(ConfigurationError, match=TEAM_ID_MISMATCH_ERROR):
             team_config_manager.load_team("team_a")
 
     def test_load_team_data_format_success(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """データフォーマット設定の正常読み込みテスト."""
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "チームA",
-            },
-            "data_format": {
-                "columns": [
-                    {"name": "col1", "type": "string", "required": True},
-                ],
-            },
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_DATA_FORMAT_YAML, encoding="utf-8")
 
         data_format = team_config_manager.load_team_data_format("team_a")
 
-        if "columns" not in data_format:
-            msg = "Expected 'columns' in data_format"
-            raise AssertionError(msg)
-        if len(data_format["columns"]) != 1:
-            msg = f"Expected 1 column, got {len(data_format['columns'])}"
-            raise AssertionError(msg)
+        assert "columns" in data_format
+        assert len(data_format["columns"]) == 1
 
     def test_load_team_calculation_rules_success(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """計算ルール設定の正常読み込みテスト."""
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "チームA",
-            },
-            "calculation_rules": [
-                {
-                    "name": "test_rule",
-                    "formula": "a + b",
-                    "description": "テストルール",
-                },
-            ],
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_CALCULATION_RULES_YAML, encoding="utf-8")
 
         rules = team_config_manager.load_team_calculation_rules("team_a")
 
-        if len(rules) != 1:
-            msg = f"Expected 1 rule, got {len(rules)}"
-            raise AssertionError(msg)
-        if rules[0].name != "test_rule":
-            msg = f"Expected rule name 'test_rule', got {rules[0].name}"
-            raise AssertionError(msg)
+        assert len(rules) == 1
+        assert rules[0].name == "test_rule"
+
+    def test_load_team_calculation_rules_reuses_parsed_rules(
+        self, team_config_manager: TeamConfigManager, temp_config_dir: Path,
+    ) -> None:
+        """設定ファイルが更新されるまでは計算ルールを再解析しないことをテスト."""
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_CALCULATION_RULES_YAML, encoding="utf-8")
+
+        first = team_config_manager.load_team_calculation_rules("team_a")
+        with patch("src.infrastructure.config.loader.parse_calculation_rules") as mock_parse:
+            second = team_config_manager.load_team_calculation_rules("team_a")
+        mock_parse.assert_not_called()
+
+        assert second == first
+        assert second is not first
 
     def test_load_team_missing_data_format(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """データフォーマット設定が不足している場合のエラーテスト."""
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "チームA",
-            },
-            # data_format セクションなし
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_ONLY_YAML, encoding="utf-8")
 
-        with pytest.raises(ConfigurationError, match="データフォーマット設定が見つかりません"):
+        with pytest.raises(ConfigurationError, match=MISSING_DATA_FORMAT_ERROR):
             team_config_manager.load_team_data_format("team_a")
 
     def test_load_team_missing_calculation_rules(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
         """計算ルール設定が不足している場合のエラーテスト."""
-        team_config_content = {
-            "team": {
-                "id": "team_a",
-                "name": "チームA",
-            },
-            # calculation_rules セクションなし
-        }
-        teams_dir = temp_config_dir / "teams"
-        team_config_path = teams_dir / "team_a.yaml"
-        with team_config_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_config_content, f)
+        (temp_config_dir / "teams" / "team_a.yaml").write_text(_TEAM_A_ONLY_YAML, encoding="utf-8")
 
-        with pytest.raises(ConfigurationError, match="計算ルール設定が見つかりません"):
+        with pytest.raises(ConfigurationError, match=MISSING_CALCULATION_RULES_ERROR):
             team_config_manager.load_team_calculation_rules("team_a")
 
     def test_load_all_teams_success(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
@@ -301,69 +273,40 @@ class TestTeamConfigManager:
         teams_dir = temp_config_dir / "teams"
 
         # 複数のチーム設定ファイルを作成
-        teams_data = {
-            "team_a": {"id": "team_a", "name": "チームA", "description": "説明A"},
-            "team_b": {"id": "team_b", "name": "チームB", "description": "説明B"},
+        teams_yaml = {
+            "team_a": "team:\n  id: team_a\n  name: チームA\n  description: 説明A\n",
+            "team_b": "team:\n  id: team_b\n  name: チームB\n  description: 説明B\n",
         }
-
-        for team_id, team_data in teams_data.items():
-            team_config_content = {"team": team_data}
-            team_config_path = teams_dir / f"{team_id}.yaml"
-            with team_config_path.open("w", encoding="utf-8") as f:
-                yaml.dump(team_config_content, f)
+        for team_id, team_yaml in teams_yaml.items():
+            (teams_dir / f"{team_id}.yaml").write_text(team_yaml, encoding="utf-8")
 
         teams = team_config_manager.load_all_teams()
 
         expected_team_count = 2
-        if len(teams) != expected_team_count:
-            msg = f"Expected {expected_team_count} teams, got {len(teams)}"
-            raise AssertionError(msg)
+        assert len(teams) == expected_team_count
 
         for team_id in ["team_a", "team_b"]:
-            if team_id not in teams:
-                msg = f"Expected team {team_id} to be loaded"
-                raise AssertionError(msg)
-            if teams[team_id].id != team_id:
-                msg = f"Expected team id {team_id}, got {teams[team_id].id}"
-                raise AssertionError(msg)
-
-    def test_load_team_missing_required_fields(self, team_config_manager: TeamConfigManager, temp_config_dir: Path) -> None:
+            assert team_id in teams
+            assert teams[team_id].id == team_id
+
+    @pytest.mark.parametrize(
+        ("team_yaml", "error_pattern"),
+        [
+            pytest.param("team:\n  name: チームA\n", MISSING_TEAM_ID_ERROR, id="missing_id"),
+            pytest.param("team:\n  id: team_a\n", MISSING_TEAM_NAME_ERROR, id="missing_name"),
+            pytest.param("team:\n  id: ''\n  name: チームA\n", MISSING_TEAM_ID_ERROR, id="empty_id"),
+            pytest.param("team:\n  id: team_a\n  name: ''\n", MISSING_TEAM_NAME_ERROR, id="empty_name"),
+        ],
+    )
+    def test_load_team_missing_required_fields(
+        self, team_config_manager: TeamConfigManager, temp_config_dir: Path, team_yaml: str, error_pattern: re.Pattern[str],
+    ) -> None:
         """必須フィールドが不足している場合のエラーテスト."""
-        test_cases = [
-            # id フィールド不足
-            {
-                "config": {"team": {"name": "チームA"}},
-                "error_pattern": "必須フィールドが不足または空です: team.id",
-            },
-            # name フィールド不足
-            {
-                "config": {"team": {"id": "team_a"}},
-                "error_pattern": "必須フィールドが不足または空です: team.name",
-            },
-            # id が空文字
-            {
-                "config": {"team": {"id": "", "name": "チームA"}},
-                "error_pattern": "必須フィールドが不足または空です: team.id",
-            },
-            # name が空文字
-            {
-                "config": {"team": {"id": "team_a", "name": ""}},
-                "error_pattern": "必須フィールドが不足または空です: team.name",
-            },
-        ]
-
-        teams_dir = temp_config_dir / "teams"
-
-        for i, test_case in enumerate(test_cases):
-            team_config_path = teams_dir / f"test_team_{i}.yaml"
-            with team_config_path.open("w", encoding="utf-8") as f:
-                yaml.dump(test_case["config"], f)
-
-            with pytest.raises(ConfigurationError, match=test_case["error_pattern"]):
-                team_config_manager.load_team(f"test_team_{i}")
+        # ケースごとに tmp_path が分かれるため後片付けは不要
+        (temp_config_dir / "teams" / "test_team.yaml").write_text(team_yaml, encoding="utf-8")
 
-            # テストファイルをクリーンアップ
-            team_config_path.unlink()
+        with pytest.raises(ConfigurationError, match=error_pattern):
+            team_config_manager.load_team("test_team")
 
 
 class TestConfigLoaderErrorHandling:
@@ -382,7 +325,7 @@ class TestConfigLoaderErrorHandling:
         file_path = tmp_path / "not_a_directory.txt"
         file_path.write_text("test content")
 
-        with pytest.raises(ConfigurationError, match="設定パスがディレクトリではありません"):
+        with pytest.raises(ConfigurationError, match=CONFIG_PATH_NOT_DIR_ERROR):
             ConfigLoader(file_path)
 
     def test_load_empty_yaml_file(self, tmp_path: Path) -> None:
@@ -396,7 +339,7 @@ class TestConfigLoaderErrorHandling:
 
         config_loader = ConfigLoader(config_dir)
 
-        with pytest.raises(ConfigurationError, match="ファイルが空または不正です"):
+        with pytest.raises(ConfigurationError, match=EMPTY_FILE_ERROR):
             config_loader.load_app_config()
 
     def test_load_yaml_file_read_permission_error(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
@@ -419,7 +362,7 @@ class TestConfigLoaderErrorHandling:
 
         monkeypatch.setattr(Path, "open", mock_open)
 
-        with pytest.raises(ConfigurationError, match="読み込みに失敗しました"):
+        with pytest.raises(ConfigurationError, match=LOAD_FAILED_ERROR):
             config_loader.load_app_config()
 
     def test_teams_directory_not_exists(self, tmp_path: Path) -> None:
@@ -430,7 +373,7 @@ class TestConfigLoaderErrorHandling:
 
         config_loader = ConfigLoader(config_dir)
 
-        with pytest.raises(ConfigurationError, match="チーム設定ディレクトリが存在しません"):
+        with pytest.raises(ConfigurationError, match=TEAMS_DIR_NOT_FOUND_ERROR):
             config_loader.get_available_teams()
 
 
@@ -451,7 +394,7 @@ class TestTeamConfigManagerErrorHandling:
         config_loader = ConfigLoader(temp_config_dir)
         team_config_manager = TeamConfigManager(config_loader)
 
-        with pytest.raises(ConfigurationError, match="ファイルが存在しません"):
+        with pytest.raises(ConfigurationError, match=FILE_NOT_FOUND_ERROR):
             team_config_manager.load_team("nonexistent_team")
 
     def test_load_team_yaml_syntax_error(self, temp_config_dir: Path) -> None:
@@ -465,7 +408,7 @@ class TestTeamConfigManagerErrorHandling:
         config_loader = ConfigLoader(temp_config_dir)
         team_config_manager = TeamConfigManager(config_loader)
 
-        with pytest.raises(ConfigurationError, match="YAML 構文エラー"):
+        with pytest.raises(ConfigurationError, match=YAML_SYNTAX_ERROR):
             team_config_manager.load_team("broken_team")
 
     def test_load_all_teams_configuration_error_propagation(self, temp_config_dir: Path) -> None:
@@ -473,22 +416,18 @@ class TestTeamConfigManagerErrorHandling:
         teams_dir = temp_config_dir / "teams"
 
         # 正常なチーム設定
-        team_a_config = {"team": {"id": "team_a", "name": "チームA"}}
         team_a_path = teams_dir / "team_a.yaml"
-        with team_a_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_a_config, f)
+        team_a_path.write_text(_TEAM_A_ONLY_YAML, encoding="utf-8")
 
         # 不正なチーム設定（必須フィールド不足）
-        team_b_config = {"team": {"id": "team_b"}}  # name フィールド不足
         team_b_path = teams_dir / "team_b.yaml"
-        with team_b_path.open("w", encoding="utf-8") as f:
-            yaml.dump(team_b_config, f)
+        team_b_path.write_text("team:\n  id: team_b\n", encoding="utf-8")  # name フィールド不足
 
         config_loader = ConfigLoader(temp_config_dir)
         team_config_manager = TeamConfigManager(config_loader)
 
         # 不正な設定により全体の読み込みがエラーになることを確認
-        with pytest.raises(ConfigurationError, match="必須フィールドが不足または空です"):
+        with pytest.raises(ConfigurationError, match=MISSING_REQUIRED_FIELD_ERROR):
             team_config_manager.load_all_teams()
 
     def test_load_team_data_format_configuration_error_propagation(self, temp_config_dir: Path) -> None:
@@ -502,7 +441,7 @@ class TestTeamConfigManagerErrorHandling:
         config_loader = ConfigLoader(temp_config_dir)
         team_config_manager = TeamConfigManager(config_loader)
 
-        with pytest.raises(ConfigurationError, match="YAML 構文エラー"):
+        with pytest.raises(ConfigurationError, match=YAML_SYNTAX_ERROR):
             team_config_manager.load_team_data_format("error_team")
 
     def test_load_team_calculation_rules_configuration_error_propagation(self, temp_config_dir: Path) -> None:
@@ -516,7 +455,7 @@ class TestTeamConfigManagerErrorHandling:
         config_loader = ConfigLoader(temp_config_dir)
         team_config_manager = TeamConfigManager(config_loader)
 
-        with pytest.raises(ConfigurationError, match="YAML 構文エラー"):
+        with pytest.raises(ConfigurationError, match=YAML_SYNTAX_ERROR):
             team_config_manager.load_team_calculation_rules("error_team")
 
     def test_team_config_manager_default_config_loader(self) -> None:
@@ -524,9 +463,5 @@ class TestTeamConfigManagerErrorHandling:
         # デフォルトコンストラクタでConfigLoaderが作成されることを確認
         team_config_manager = TeamConfigManager()
 
-        if team_config_manager.config_loader is None:
-            msg = "Expected config_loader to be created"
-            raise AssertionError(msg)
-        if not isinstance(team_config_manager.config_loader, ConfigLoader):
-            msg = f"Expected ConfigLoader instance, got {type(team_config_manager.config_loader)}"
-            raise AssertionError(msg)  # noqa: TRY004
+        assert team_config_manager.config_loader is not None
+        assert isinstance(team_config_manager.config_loader, ConfigLoader)
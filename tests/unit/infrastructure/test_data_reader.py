@@ -1,4 +1,5 @@
 """DataReaderのユニットテスト."""
+import os
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -52,6 +53,17 @@ class TestDataReader:
         expected = (tmp_path / rel_path).resolve()
         assert result == expected
 
+    def test_resolve_path_reuses_resolved_path(self, tmp_path: Path) -> None:
+        """同じ相対パスの2回目以降の解決ではresolveを呼ばない."""
+        reader = DataReader(project_root=tmp_path)
+        first = reader._resolve_path("data/test.csv")  # noqa: SLF001
+
+        with patch.object(Path, "resolve") as mock_resolve:
+            second = reader._resolve_path("data/test.csv")  # noqa: SLF001
+
+        mock_resolve.assert_not_called()
+        assert second == first
+
     def test_validate_and_get_data_source_missing(self) -> None:
         """data_sourceセクションが無い場合にエラー."""
         reader = DataReader()
@@ -81,11 +93,16 @@ class TestDataReader:
             reader._get_csv_path(data_source)  # noqa: SLF001
 
     def test_get_csv_path_not_exists(self, tmp_path: Path) -> None:
-        """CSVファイルが存在しない場合にエラー."""
+        """CSVファイルが存在しない場合は stat / 読み込みの時点でエラー."""
         reader = DataReader(project_root=tmp_path)
-        data_source = {"path": "nonexistent.csv"}
+        data_source = {"kind": "local_csv", "path": "nonexistent.csv"}
+        csv_path = reader._get_csv_path(data_source)  # noqa: SLF001
+        assert csv_path.name == "nonexistent.csv"
+
         with pytest.raises(DataSourceError, match="CSVファイルが存在しません"):
-            reader._get_csv_path(data_source)  # noqa: SLF001
+            reader._get_source_version(data_source)  # noqa: SLF001
+        with pytest.raises(DataSourceError, match="CSVファイルが存在しません"):
+            reader._read_csv(csv_path, {})  # noqa: SLF001
 
     def test_get_csv_path_success(self, tmp_path: Path, temp_csv: Path) -> None:
         """CSVパスが正しく返される."""
@@ -102,6 +119,14 @@ class TestDataReader:
         assert list(df.columns) == ["name", "age", "score"]
         assert df.iloc[0]["name"] == "Alice"
 
+    def test_read_csv_ignores_fadvise_error(self, temp_csv: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """先読みヒントの通知に失敗しても読み込みは成功する."""
+        monkeypatch.setattr(os, "posix_fadvise", Mock(side_effect=OSError("not supported")), raising=False)
+        monkeypatch.setattr(os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+        reader = DataReader()
+        df = reader._read_csv(temp_csv, {})  # noqa: SLF001
+        assert len(df) == 2
+
     def test_read_csv_with_options(self, tmp_path: Path) -> None:
         """CSV読み込みオプションが適用される."""
         csv_path = tmp_path / "data.csv"
@@ -111,6 +136,26 @@ class TestDataReader:
         assert len(df) == 2
         assert 0 in df.columns  # ヘッダー無しなので数値列名
 
+    def test_read_csv_with_dtype(self, tmp_path: Path) -> None:
+        """指定した列は既定の読み込み経路でも文字列型として扱われ、先頭の0が残る."""
+        csv_path = tmp_path / "codes.csv"
+        csv_path.write_text("code,value\n00123,1\n04567,2\n", encoding="utf-8")
+        reader = DataReader()
+        df = reader._read_csv(csv_path, {}, {"code": "string"})  # noqa: SLF001
+        assert df["code"].tolist() == ["00123", "04567"]
+        assert df["value"].tolist() == [1, 2]
+
+    def test_load_local_csv_keeps_leading_zeros_of_string_columns(self, tmp_path: Path) -> None:
+        """data_format で文字列型とした列は、読み込み時に数値として解釈されない."""
+        csv_path = tmp_path / "codes.csv"
+        csv_path.write_text("code,value\n007,1\n010,2\n", encoding="utf-8")
+        reader = DataReader(project_root=tmp_path)
+        data_format = {"columns": [{"name": "code", "type": "string"}, {"name": "value", "type": "int"}]}
+
+        df = reader._load_local_csv({"path": str(csv_path)}, data_format)  # noqa: SLF001
+
+        assert df["code"].tolist() == ["007", "010"]
+
     def test_read_csv_invalid_encoding(self, tmp_path: Path) -> None:
         """エンコーディングエラーでDataSourceErrorが発生."""
         invalid_csv = tmp_path / "invalid.csv"
@@ -134,34 +179,106 @@ class TestDataReader:
         reader._apply_type_conversions(df, {})  # noqa: SLF001
         assert df["a"].dtype == object
 
-    def test_convert_column_type_int(self) -> None:
+    def test_apply_type_conversions_in_parallel(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """GILが無効な環境では列ごとの変換を並列に行い、同じ結果になる."""
+        monkeypatch.setattr("src.infrastructure.data.reader._GIL_ENABLED", False)
+        reader = DataReader()
+        df = pd.DataFrame({"num": ["1", "2"], "val": ["1.5", "x"], "text": ["a", "b"]})
+        data_format = {
+            "columns": [
+                {"name": "num", "type": "int"},
+                {"name": "val", "type": "float"},
+                {"name": "missing", "type": "int"},
+            ],
+        }
+        reader._apply_type_conversions(df, data_format)  # noqa: SLF001
+        assert pd.api.types.is_integer_dtype(df["num"])
+        assert pd.api.types.is_float_dtype(df["val"])
+        assert df["val"].isna().tolist() == [False, True]
+        assert df["text"].dtype == object
+
+    def test_convert_series_int(self) -> None:
         """int型変換が正しく動作."""
         reader = DataReader()
         df = pd.DataFrame({"num": ["1", "2", "3"]})
-        reader._convert_column_type(df, "num", "int", {})  # noqa: SLF001
-        assert df["num"].dtype.name == "Int64"
+        df["num"] = reader._convert_series(df["num"], "int", {})  # noqa: SLF001
+        assert pd.api.types.is_integer_dtype(df["num"])
         assert df["num"].iloc[0] == 1
 
-    def test_convert_column_type_float(self) -> None:
+    def test_convert_series_int_uses_arrow_dtype(self) -> None:
+        """pyarrowが利用可能な場合はArrowバックエンドの整数型になり、欠損値を保持する."""
+        pytest.importorskip("pyarrow")
+        reader = DataReader()
+        df = pd.DataFrame({"num": ["1", "x", "3"]})
+        df["num"] = reader._convert_series(df["num"], "int", {})  # noqa: SLF001
+        assert df["num"].dtype == "int64[pyarrow]"
+        assert df["num"].isna().tolist() == [False, True, False]
+
+    def test_apply_type_conversions_int_with_invalid_cell_from_csv(self, tmp_path: Path) -> None:
+        """既定の読み込み経路で文字列として読まれた int 列も、解釈できない値を欠損値にして変換する."""
+        pytest.importorskip("pyarrow")
+        csv_path = tmp_path / "data.csv"
+        csv_path.write_text("num\n1\nabc\n3\n", encoding="utf-8")
+        reader = DataReader()
+        df = reader._read_csv(csv_path, {})  # noqa: SLF001
+
+        reader._apply_type_conversions(df, {"columns": [{"name": "num", "type": "int"}]})  # noqa: SLF001
+
+        assert df["num"].dtype == "int64[pyarrow]"
+        assert df["num"].isna().tolist() == [False, True, False]
+        assert df["num"].iloc[2] == 3
+
+    def test_convert_series_int_with_fraction(self) -> None:
+        """int列の小数や範囲外の値は、列全体をエラーにせず欠損値にする."""
+        reader = DataReader()
+        series = pd.Series(["1", "1.5", "inf", "1e30", "-4"], name="num")
+
+        result = reader._convert_series(series, "int", {})  # noqa: SLF001
+
+        assert pd.api.types.is_integer_dtype(result)
+        assert result.isna().tolist() == [False, True, True, True, False]
+        assert result.iloc[4] == -4
+
+    def test_apply_type_conversions_int_with_fraction_from_csv(self, tmp_path: Path) -> None:
+        """CSVのint列に小数のセルがあっても読み込みは失敗しない."""
+        csv_path = tmp_path / "data.csv"
+        csv_path.write_text("num\n1\n1.5\n3\n", encoding="utf-8")
+        reader = DataReader()
+        df = reader._read_csv(csv_path, {})  # noqa: SLF001
+
+        reader._apply_type_conversions(df, {"columns": [{"name": "num", "type": "int"}]})  # noqa: SLF001
+
+        assert pd.api.types.is_integer_dtype(df["num"])
+        assert df["num"].isna().tolist() == [False, True, False]
+
+    def test_convert_series_float(self) -> None:
         """float型変換が正しく動作."""
         reader = DataReader()
         df = pd.DataFrame({"val": ["1.5", "2.7"]})
-        reader._convert_column_type(df, "val", "float", {})  # noqa: SLF001
-        assert df["val"].dtype == float
+        df["val"] = reader._convert_series(df["val"], "float", {})  # noqa: SLF001
+        assert pd.api.types.is_float_dtype(df["val"])
         assert df["val"].iloc[0] == 1.5
 
-    def test_convert_column_type_datetime(self) -> None:
+    def test_convert_series_datetime(self) -> None:
         """datetime型変換が正しく動作."""
         reader = DataReader()
         df = pd.DataFrame({"date": ["2025-01-01", "2025-12-31"]})
-        reader._convert_column_type(df, "date", "datetime", {"format": "%Y-%m-%d"})  # noqa: SLF001
+        df["date"] = reader._convert_series(df["date"], "datetime", {"format": "%Y-%m-%d"})  # noqa: SLF001
         assert pd.api.types.is_datetime64_any_dtype(df["date"])
 
-    def test_convert_column_type_string(self) -> None:
+    def test_convert_series_datetime_iso8601_without_format(self) -> None:
+        """書式指定なしのISO8601文字列が日時型に変換される."""
+        reader = DataReader()
+        df = pd.DataFrame({"date": [None, "2025-01-01", "2025-12-31T10:30:00"]})
+        df["date"] = reader._convert_series(df["date"], "datetime", {})  # noqa: SLF001
+        assert pd.api.types.is_datetime64_any_dtype(df["date"])
+        assert df["date"].iloc[2] == pd.Timestamp("2025-12-31 10:30:00")
+
+    def test_convert_series_string(self) -> None:
         """string型変換が正しく動作."""
         reader = DataReader()
         df = pd.DataFrame({"text": [1, 2, 3]})
-        reader._convert_column_type(df, "text", "string", {})  # noqa: SLF001
+        df["text"] = reader._convert_series(df["text"], "string", {})  # noqa: SLF001
         assert df["text"].dtype.name == "string"
 
     def test_load_local_csv_success(self, tmp_path: Path, temp_csv: Path) -> None:
@@ -199,5 +316,49 @@ class TestDataReader:
         df = reader.load_team_dataframe("test_team", data_format)
         assert len(df) == 2
         assert pd.api.types.is_datetime64_any_dtype(df["date"])
-        assert df["value"].dtype.name == "Int64"
+        assert pd.api.types.is_integer_dtype(df["value"])
         assert df["value"].iloc[0] == 100
+
+    def test_load_team_dataframe_uses_cache_until_file_changes(
+        self, tmp_path: Path, mock_config_loader: Mock,
+    ) -> None:
+        """CSVが更新されるまでは読み込み結果を再利用する."""
+        csv_path = tmp_path / "team.csv"
+        csv_path.write_text("value\n100\n")
+        mock_config_loader.return_value.load_team_config.return_value = {
+            "data_source": {"kind": "local_csv", "path": str(csv_path)},
+        }
+        reader = DataReader(project_root=tmp_path)
+        data_format = {"columns": [{"name": "value", "type": "int"}]}
+
+        first = reader.load_team_dataframe("test_team", data_format)
+        first["extra"] = 1  # 返り値の変更はキャッシュに影響しない
+
+        with patch("src.infrastructure.data.reader.pd.read_csv") as mock_read_csv:
+            second = reader.load_team_dataframe("test_team", data_format)
+        mock_read_csv.assert_not_called()
+        assert list(second.columns) == ["value"]
+
+        mtime_ns = csv_path.stat().st_mtime_ns
+        csv_path.write_text("value\n200\n")
+        os.utime(csv_path, ns=(mtime_ns + 1_000_000_000, mtime_ns + 1_000_000_000))
+
+        reloaded = reader.load_team_dataframe("test_team", data_format)
+        assert reloaded["value"].iloc[0] == 200
+
+    def test_get_source_version_changes_when_file_changes(
+        self, tmp_path: Path, mock_config_loader: Mock,
+    ) -> None:
+        """チームのデータソースのバージョンがCSVの更新で変わる."""
+        csv_path = tmp_path / "team.csv"
+        csv_path.write_text("value\n100\n")
+        mock_config_loader.return_value.load_team_config.return_value = {
+            "data_source": {"kind": "local_csv", "path": str(csv_path)},
+        }
+        reader = DataReader(project_root=tmp_path)
+
+        version = reader.get_source_version("test_team")
+        assert version == csv_path.stat().st_mtime_ns
+
+        os.utime(csv_path, ns=(version + 1_000_000_000, version + 1_000_000_000))
+        assert reader.get_source_version("test_team") == version + 1_000_000_000
@@ -1,10 +1,11 @@
 """Integration tests for the calculation engine with real config files."""
 
+import shutil
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
-import yaml
 
 from src.domain.calculation import CalculationEngine
 from src.domain.data_format import DataValidator, parse_data_format
@@ -14,73 +15,106 @@ from src.infrastructure.config.loader import (
     TeamConfigManager,
 )
 
+# test_full_calculation_workflow の期待値
+EXPECTED_GROSS_REVENUE = np.array([1000.0, 3000.0, 3000.0, 400.0])  # quantity * unit_price
+EXPECTED_DISCOUNT_AMOUNT = np.array([100.0, 150.0, 0.0, 80.0])      # gross_revenue * discount_rate
+EXPECTED_NET_REVENUE = np.array([900.0, 2850.0, 3000.0, 320.0])     # gross_revenue - discount_amount
+
+# test_complex_calculation_formula の期待値
+EXPECTED_BASE_VALUE = np.array([1000.0, 1000.0])          # quantity * unit_price
+EXPECTED_TAX_AMOUNT = np.array([100.0, 80.0])             # base_value * tax_rate
+EXPECTED_TOTAL_WITH_TAX = np.array([1100.0, 1080.0])      # base_value + tax_amount
+EXPECTED_FINAL_AMOUNT = np.array([1050.0, 1050.0])        # total_with_tax - discount_amount
+
+
+# テスト用に書き出すチーム設定のYAML
+_TEST_TEAM_YAML = (
+    "team:\n"
+    "  id: test_team\n"
+    "  name: テストチーム\n"
+    "  description: 統合テスト用チーム\n"
+    "data_format:\n"
+    "  columns:\n"
+    "  - name: quantity\n"
+    "    type: int\n"
+    "    required: true\n"
+    "  - name: unit_price\n"
+    "    type: float\n"
+    "    required: true\n"
+    "  - name: discount_rate\n"
+    "    type: float\n"
+    "    required: false\n"
+    "    default: 0.0\n"
+    "calculation_rules:\n"
+    "- name: gross_revenue\n"
+    "  formula: quantity * unit_price\n"
+    "  description: 粗売上\n"
+    "- name: discount_amount\n"
+    "  formula: gross_revenue * discount_rate\n"
+    "  description: 割引金額\n"
+    "- name: net_revenue\n"
+    "  formula: gross_revenue - discount_amount\n"
+    "  description: 純売上\n"
+    "- name: total_revenue\n"
+    "  formula: SUM(net_revenue)\n"
+    "  description: 売上合計\n"
+)
+
+# test_complex_calculation_formula で追加するチーム設定のYAML
+_COMPLEX_TEAM_YAML = (
+    "team:\n"
+    "  id: complex_team\n"
+    "  name: 複雑計算チーム\n"
+    "calculation_rules:\n"
+    "- name: base_value\n"
+    "  formula: quantity * unit_price\n"
+    "  description: 基本値\n"
+    "- name: tax_amount\n"
+    "  formula: base_value * tax_rate\n"
+    "  description: 税額\n"
+    "- name: total_with_tax\n"
+    "  formula: base_value + tax_amount\n"
+    "  description: 税込み合計\n"
+    "- name: final_amount\n"
+    "  formula: total_with_tax - discount_amount\n"
+    "  description: 最終金額\n"
+)
+
 
 class TestCalculationEngineIntegration:
     """計算エンジンの統合テスト."""
 
-    @pytest.fixture
-    def temp_config_dir(self, tmp_path: Path) -> Path:
-        """テスト用の一時設定ディレクトリを作成."""
-        config_dir = tmp_path / "config"
-        config_dir.mkdir()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def temp_config_dir(cls, tmp_path_factory: pytest.TempPathFactory) -> Path:
+        """テスト用の一時設定ディレクトリを作成(クラス内で共有するため、テストでは変更しないこと)."""
+        config_dir = tmp_path_factory.mktemp("config")
 
         teams_dir = config_dir / "teams"
         teams_dir.mkdir()
 
         # テスト用のチーム設定ファイルを作成
-        team_config = {
-            "team": {
-                "id": "test_team",
-                "name": "テストチーム",
-                "description": "統合テスト用チーム",
-            },
-            "data_format": {
-                "columns": [
-                    {"name": "quantity", "type": "int", "required": True},
-                    {"name": "unit_price", "type": "float", "required": True},
-                    {"name": "discount_rate", "type": "float", "required": False, "default": 0.0},
-                ],
-            },
-            "calculation_rules": [
-                {
-                    "name": "gross_revenue",
-                    "formula": "quantity * unit_price",
-                    "description": "粗売上",
-                },
-                {
-                    "name": "discount_amount",
-                    "formula": "gross_revenue * discount_rate",
-                    "description": "割引金額",
-                },
-                {
-                    "name": "net_revenue",
-                    "formula": "gross_revenue - discount_amount",
-                    "description": "純売上",
-                },
-                {
-                    "name": "total_revenue",
-                    "formula": "SUM(net_revenue)",
-                    "description": "売上合計",
-                },
-            ],
-        }
-
-        with (teams_dir / "test_team.yaml").open("w", encoding="utf-8") as f:
-            yaml.dump(team_config, f)
+        (teams_dir / "test_team.yaml").write_text(_TEST_TEAM_YAML, encoding="utf-8")
 
         return config_dir
 
+    @pytest.fixture(scope="class")
+    @classmethod
+    def engine(cls) -> CalculationEngine:
+        """CalculationEngineインスタンスを作成(状態を持たないためクラス内で共有)."""
+        return CalculationEngine()
+
     @pytest.fixture
     def sample_data(self) -> pd.DataFrame:
         """サンプルデータを作成."""
         return pd.DataFrame({
-            "quantity": [10, 20, 15, 5],
-            "unit_price": [100.0, 150.0, 200.0, 80.0],
-            "discount_rate": [0.1, 0.05, 0.0, 0.2],
+            "quantity": np.array([10, 20, 15, 5], dtype=np.int64),
+            "unit_price": np.array([100.0, 150.0, 200.0, 80.0]),
+            "discount_rate": np.array([0.1, 0.05, 0.0, 0.2]),
         })
 
     def test_full_calculation_workflow(
-        self, temp_config_dir: Path, sample_data: pd.DataFrame,
+        self, temp_config_dir: Path, sample_data: pd.DataFrame, engine: CalculationEngine,
     ) -> None:
         """設定ファイルから計算ルールを読み込んで実際に計算を実行する統合テスト."""
         # 設定マネージャーを初期化
@@ -91,12 +125,7 @@ class TestCalculationEngineIntegration:
         calculation_rules = team_config_manager.load_team_calculation_rules("test_team")
 
         expected_rules_count = 4
-        if len(calculation_rules) != expected_rules_count:
-            msg = f"Expected {expected_rules_count} calculation rules, got {len(calculation_rules)}"
-            raise AssertionError(msg)
-
-        # 計算エンジンを初期化
-        engine = CalculationEngine()
+        assert len(calculation_rules) == expected_rules_count
 
         # 基本計算ルール(集約以外)を適用
         basic_rules = [
@@ -107,43 +136,21 @@ class TestCalculationEngineIntegration:
 
         # 結果の検証
         expected_rows = 4
-        if len(result_df) != expected_rows:
-            msg = f"Expected {expected_rows} rows, got {len(result_df)}"
-            raise AssertionError(msg)
+        assert len(result_df) == expected_rows
 
         # 元の列が保持されているか確認
-        original_columns = ["quantity", "unit_price", "discount_rate"]
-        if not all(col in result_df.columns for col in original_columns):
-            msg = f"Original columns should be preserved: {original_columns}"
-            raise AssertionError(msg)
+        original_columns = {"quantity", "unit_price", "discount_rate"}
+        assert original_columns <= set(result_df.columns)
 
         # 新しい計算列が追加されているか確認
-        new_columns = ["gross_revenue", "discount_amount", "net_revenue"]
-        if not all(col in result_df.columns for col in new_columns):
-            msg = f"New calculated columns should be added: {new_columns}"
-            raise AssertionError(msg)
+        new_columns = {"gross_revenue", "discount_amount", "net_revenue"}
+        assert new_columns <= set(result_df.columns)
 
         # 具体的な計算結果の検証
-        expected_gross = [1000.0, 3000.0, 3000.0, 400.0]  # quantity * unit_price
-        expected_discount = [100.0, 150.0, 0.0, 80.0]     # gross_revenue * discount_rate
-        expected_net = [900.0, 2850.0, 3000.0, 320.0]     # gross_revenue - discount_amount
-
-        pd.testing.assert_series_equal(
-            result_df["gross_revenue"],
-            pd.Series(expected_gross, name="gross_revenue"),
-            check_names=False,
-        )
-
-        pd.testing.assert_series_equal(
-            result_df["discount_amount"],
-            pd.Series(expected_discount, name="discount_amount"),
-            check_names=False,
-        )
-
-        pd.testing.assert_series_equal(
-            result_df["net_revenue"],
-            pd.Series(expected_net, name="net_revenue"),
-            check_names=False,
+        np.testing.assert_allclose(
+            result_df[["gross_revenue", "discount_amount", "net_revenue"]].to_numpy(),
+            np.column_stack([EXPECTED_GROSS_REVENUE, EXPECTED_DISCOUNT_AMOUNT, EXPECTED_NET_REVENUE]),
+            rtol=1e-12,
         )
 
     def test_data_format_validation_integration(self, temp_config_dir: Path) -> None:
@@ -155,9 +162,7 @@ class TestCalculationEngineIntegration:
         # データフォーマット設定を読み込み
         data_format_config = team_config_manager.load_team_data_format("test_team")
 
-        if "columns" not in data_format_config:
-            msg = "Expected 'columns' in data format config"
-            raise AssertionError(msg)
+        assert "columns" in data_format_config
 
         # データフォーマットオブジェクトを作成
         data_format = parse_data_format(data_format_config)
@@ -165,15 +170,13 @@ class TestCalculationEngineIntegration:
 
         # 正常なデータの検証
         valid_df = pd.DataFrame({
-            "quantity": [10, 20],
-            "unit_price": [100.0, 150.0],
-            "discount_rate": [0.1, 0.0],
+            "quantity": np.array([10, 20], dtype=np.int64),
+            "unit_price": np.array([100.0, 150.0]),
+            "discount_rate": np.array([0.1, 0.0]),
         })
 
         errors = validator.validate_dataframe(valid_df)
-        if len(errors) > 0:
-            msg = f"Expected no errors for valid data, got: {errors}"
-            raise AssertionError(msg)
+        assert errors == []
 
         # 型変換テスト
         string_data_df = pd.DataFrame({
@@ -184,13 +187,8 @@ class TestCalculationEngineIntegration:
 
         converted_df = validator.convert_dataframe(string_data_df)
 
-        if not pd.api.types.is_integer_dtype(converted_df["quantity"]):
-            msg = f"Expected quantity to be integer type, got {converted_df['quantity'].dtype}"
-            raise AssertionError(msg)
-
-        if not pd.api.types.is_float_dtype(converted_df["unit_price"]):
-            msg = f"Expected unit_price to be float type, got {converted_df['unit_price'].dtype}"
-            raise AssertionError(msg)
+        assert pd.api.types.is_integer_dtype(converted_df["quantity"])
+        assert pd.api.types.is_float_dtype(converted_df["unit_price"])
 
     def test_config_error_handling(self, tmp_path: Path) -> None:
         """設定エラーのハンドリング統合テスト."""
@@ -212,84 +210,32 @@ class TestCalculationEngineIntegration:
         with pytest.raises(ConfigurationError):
             team_config_manager.load_team("nonexistent_team")
 
-    def test_complex_calculation_formula(self, temp_config_dir: Path) -> None:
+    def test_complex_calculation_formula(
+        self, temp_config_dir: Path, tmp_path: Path, engine: CalculationEngine,
+    ) -> None:
         """複雑な計算式の統合テスト."""
-        # 複雑な計算式を含む設定ファイルを作成
-        teams_dir = temp_config_dir / "teams"
-        complex_config = {
-            "team": {
-                "id": "complex_team",
-                "name": "複雑計算チーム",
-            },
-            "calculation_rules": [
-                {
-                    "name": "base_value",
-                    "formula": "quantity * unit_price",
-                    "description": "基本値",
-                },
-                {
-                    "name": "tax_amount",
-                    "formula": "base_value * tax_rate",
-                    "description": "税額",
-                },
-                {
-                    "name": "total_with_tax",
-                    "formula": "base_value + tax_amount",
-                    "description": "税込み合計",
-                },
-                {
-                    "name": "final_amount",
-                    "formula": "total_with_tax - discount_amount",
-                    "description": "最終金額",
-                },
-            ],
-        }
-
-        with (teams_dir / "complex_team.yaml").open("w", encoding="utf-8") as f:
-            yaml.dump(complex_config, f)
+        # 共有の設定ディレクトリを汚さないよう、コピーに設定ファイルを追加する
+        config_dir = shutil.copytree(temp_config_dir, tmp_path / "config")
+        teams_dir = config_dir / "teams"
+        (teams_dir / "complex_team.yaml").write_text(_COMPLEX_TEAM_YAML, encoding="utf-8")
 
         # 設定を読み込んで計算実行
-        config_loader = ConfigLoader(temp_config_dir)
+        config_loader = ConfigLoader(config_dir)
         team_config_manager = TeamConfigManager(config_loader)
         calculation_rules = team_config_manager.load_team_calculation_rules("complex_team")
 
-        engine = CalculationEngine()
-
         sample_df = pd.DataFrame({
-            "quantity": [10, 5],
-            "unit_price": [100.0, 200.0],
-            "tax_rate": [0.1, 0.08],
-            "discount_amount": [50.0, 30.0],
+            "quantity": np.array([10, 5], dtype=np.int64),
+            "unit_price": np.array([100.0, 200.0]),
+            "tax_rate": np.array([0.1, 0.08]),
+            "discount_amount": np.array([50.0, 30.0]),
         })
 
         result_df = engine.apply_multiple_rules(sample_df, calculation_rules)
 
         # 計算結果の検証
-        expected_base = [1000.0, 1000.0]        # quantity * unit_price
-        expected_tax = [100.0, 80.0]            # base_value * tax_rate
-        expected_total_tax = [1100.0, 1080.0]   # base_value + tax_amount
-        expected_final = [1050.0, 1050.0]       # total_with_tax - discount_amount
-
-        pd.testing.assert_series_equal(
-            result_df["base_value"],
-            pd.Series(expected_base, name="base_value"),
-            check_names=False,
-        )
-
-        pd.testing.assert_series_equal(
-            result_df["final_amount"],
-            pd.Series(expected_final, name="final_amount"),
-            check_names=False,
-        )
-
-        pd.testing.assert_series_equal(
-            result_df["tax_amount"],
-            pd.Series(expected_tax, name="tax_amount"),
-            check_names=False,
-        )
-
-        pd.testing.assert_series_equal(
-            result_df["total_with_tax"],
-            pd.Series(expected_total_tax, name="total_with_tax"),
-            check_names=False,
+        np.testing.assert_allclose(
+            result_df[["base_value", "tax_amount", "total_with_tax", "final_amount"]].to_numpy(),
+            np.column_stack([EXPECTED_BASE_VALUE, EXPECTED_TAX_AMOUNT, EXPECTED_TOTAL_WITH_TAX, EXPECTED_FINAL_AMOUNT]),
+            rtol=1e-12,
         )
@@ -1,14 +1,15 @@
 """Unit tests for the TeamManager class."""
 
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 
+import pandas as pd
 import pytest
-import yaml
 
 from src.domain.calculation import CalculationRule
 from src.domain.team import Team
 from src.infrastructure.config.loader import ConfigurationError
+from src.infrastructure.data.reader import DataSourceError
 from src.presentation.team_manager import TeamManager
 
 # Constants for magic numbers
@@ -16,6 +17,43 @@ INITIAL_TEAM_COUNT = 2
 AFTER_CREATE_TEAM_COUNT = 3
 AFTER_DELETE_TEAM_COUNT = 1
 
+# テストで共有するサンプルチーム(Team は変更しないこと)
+TEAM_A = Team(id="team_a", name="営業チームA", description="サンプルチームA")
+TEAM_B = Team(id="team_b", name="営業チームB", description="サンプルチームB")
+SAMPLE_TEAMS = {"team_a": TEAM_A, "team_b": TEAM_B}
+
+# テスト用に書き出すチーム設定のYAML
+_TEAM_A_YAML = (
+    "team:\n"
+    "  id: team_a\n"
+    "  name: 営業チームA\n"
+    "  description: サンプルチームA\n"
+    "data_format:\n"
+    "  columns:\n"
+    "  - name: test_col\n"
+    "    type: string\n"
+    "    required: true\n"
+    "calculation_rules:\n"
+    "- name: test_rule\n"
+    "  formula: a + b\n"
+    "  description: テストルール\n"
+)
+_TEAM_B_YAML = (
+    "team:\n"
+    "  id: team_b\n"
+    "  name: 営業チームB\n"
+    "  description: サンプルチームB\n"
+    "data_format:\n"
+    "  columns:\n"
+    "  - name: other_col\n"
+    "    type: int\n"
+    "    required: false\n"
+    "calculation_rules:\n"
+    "- name: other_rule\n"
+    "  formula: x * y\n"
+    "  description: その他ルール\n"
+)
+
 
 class TestTeamManager:
     """TeamManagerのユニットテスト."""
@@ -30,285 +68,226 @@ class TestTeamManager:
         teams_dir.mkdir()
 
         # テスト用のチーム設定ファイルを作成
-        team_a_config = {
-            "team": {
-                "id": "team_a",
-                "name": "営業チームA",
-                "description": "サンプルチームA",
-            },
-            "data_format": {
-                "columns": [
-                    {"name": "test_col", "type": "string", "required": True},
-                ],
-            },
-            "calculation_rules": [
-                {"name": "test_rule", "formula": "a + b", "description": "テストルール"},
-            ],
-        }
+        (teams_dir / "team_a.yaml").write_text(_TEAM_A_YAML, encoding="utf-8")
+        (teams_dir / "team_b.yaml").write_text(_TEAM_B_YAML, encoding="utf-8")
 
-        team_b_config = {
-            "team": {
-                "id": "team_b",
-                "name": "営業チームB",
-                "description": "サンプルチームB",
-            },
-            "data_format": {
-                "columns": [
-                    {"name": "other_col", "type": "int", "required": False},
-                ],
-            },
-            "calculation_rules": [
-                {"name": "other_rule", "formula": "x * y", "description": "その他ルール"},
-            ],
-        }
+        return config_dir
 
-        with (teams_dir / "team_a.yaml").open("w", encoding="utf-8") as f:
-            yaml.dump(team_a_config, f)
-        with (teams_dir / "team_b.yaml").open("w", encoding="utf-8") as f:
-            yaml.dump(team_b_config, f)
+    @staticmethod
+    def _set_sample_teams(mock_config_manager: Mock) -> None:
+        """設定から2つのサンプルチームが読み込まれるようにモックを設定."""
+        # TeamManager は受け取った辞書にチームを追加・削除するため、マネージャーごとに浅いコピーを渡す
+        mock_config_manager.load_all_teams.return_value = dict(SAMPLE_TEAMS)
 
-        return config_dir
+    @pytest.fixture
+    def mock_config_manager(self, monkeypatch: pytest.MonkeyPatch) -> Mock:
+        """TeamManager が生成する TeamConfigManager をモックに差し替え、そのインスタンスを返す."""
+        mock_config_manager_class = Mock()
+        monkeypatch.setattr("src.presentation.team_manager.TeamConfigManager", mock_config_manager_class)
+        return mock_config_manager_class.return_value
 
     @pytest.fixture
-    def manager(self) -> TeamManager:
-        """Create a TeamManager instance for testing."""
-        with patch("src.presentation.team_manager.TeamConfigManager") as mock_config_manager_class:
-            mock_config_manager = Mock()
-            mock_config_manager_class.return_value = mock_config_manager
+    def manager(self, mock_config_manager: Mock) -> TeamManager:
+        """Create a TeamManager instance for tests that add or delete teams."""
+        self._set_sample_teams(mock_config_manager)
+        return TeamManager()
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def shared_manager(cls) -> TeamManager:
+        """Create a TeamManager shared by read-only tests (do not add or delete teams)."""
+        config_manager = Mock()
+        cls._set_sample_teams(config_manager)
+        return TeamManager(config_manager)
+
+    def test_uses_injected_dependencies(self) -> None:
+        """Test that injected config manager and data reader are used."""
+        config_manager = Mock()
+        config_manager.load_all_teams.return_value = {"team_a": TEAM_A}
+        data_reader = Mock()
+
+        manager = TeamManager(config_manager, data_reader)
+        manager.load_team_data("team_a")
+
+        config_manager.load_all_teams.assert_called_once_with()
+        data_reader.load_team_dataframe.assert_called_once()
+        assert manager.get_team_count() == 1
+
+    def test_sample_teams_exist_on_initialization(self, shared_manager: TeamManager) -> None:
+        """Test that sample teams exist when TeamManager is initialized."""
+        teams = shared_manager.get_all_teams()
 
-            # Mock the config loading
-            mock_config_manager.load_all_teams.return_value = {
-                "team_a": Team(id="team_a", name="営業チームA", description="サンプルチームA"),
-                "team_b": Team(id="team_b", name="営業チームB", description="サンプルチームB"),
-            }
+        assert len(teams) == INITIAL_TEAM_COUNT
+        assert "team_a" in teams
+        assert "team_b" in teams
 
-            return TeamManager()
+    def test_get_all_teams_is_read_only(self, shared_manager: TeamManager) -> None:
+        """Test that get_all_teams returns a read-only view."""
+        teams = shared_manager.get_all_teams()
 
-    def test_sample_teams_exist_on_initialization(self, manager: TeamManager) -> None:
-        """Test that sample teams exist when TeamManager is initialized."""
-        teams = manager.get_all_teams()
-
-        if len(teams) != INITIAL_TEAM_COUNT:
-            msg = f"Expected {INITIAL_TEAM_COUNT} teams, got {len(teams)}"
-            raise AssertionError(msg)
-        if "team_a" not in teams:
-            msg = "Expected 'team_a' to be in teams"
-            raise AssertionError(msg)
-        if "team_b" not in teams:
-            msg = "Expected 'team_b' to be in teams"
-            raise AssertionError(msg)
-
-    def test_can_get_team(self, manager: TeamManager) -> None:
+        with pytest.raises(TypeError):
+            teams["team_x"] = None  # type: ignore[index]
+
+    def test_get_team_options_reflects_team_changes(self, manager: TeamManager) -> None:
+        """Test that team options are rebuilt after creating or deleting a team."""
+        assert dict(manager.get_team_options()) == {"team_a": "営業チームA", "team_b": "営業チームB"}
+
+        manager.create_team("team_c", "営業チームC")
+        assert manager.get_team_options().get("team_c") == "営業チームC"
+
+        manager.delete_team("team_a")
+        assert "team_a" not in manager.get_team_options()
+
+    def test_can_get_team(self, shared_manager: TeamManager) -> None:
         """Test that existing team can be retrieved by ID."""
-        team = manager.get_team("team_a")
-
-        if team is None:
-            msg = "Expected team to not be None"
-            raise AssertionError(msg)
-        if team.id != "team_a":
-            msg = f"Expected team.id to be 'team_a', got {team.id}"
-            raise AssertionError(msg)
-        if team.name != "営業チームA":
-            msg = f"Expected team.name to be '営業チームA', got {team.name}"
-            raise AssertionError(msg)
-
-    def test_nonexistent_team_returns_none(self, manager: TeamManager) -> None:
+        team = shared_manager.get_team("team_a")
+
+        assert team is not None
+        assert team.id == "team_a"
+        assert team.name == "営業チームA"
+
+    def test_nonexistent_team_returns_none(self, shared_manager: TeamManager) -> None:
         """Test that getting a nonexistent team returns None."""
-        team = manager.get_team("non_existent")
+        team = shared_manager.get_team("non_existent")
 
-        if team is not None:
-            msg = f"Expected team to be None, got {team}"
-            raise AssertionError(msg)
+        assert team is None
 
     def test_can_create_new_team(self, manager: TeamManager) -> None:
         """Test that a new team can be created successfully."""
         team = manager.create_team("team_c", "チームC", "説明C")
 
-        if team.id != "team_c":
-            msg = f"Expected team.id to be 'team_c', got {team.id}"
-            raise AssertionError(msg)
-        if team.name != "チームC":
-            msg = f"Expected team.name to be 'チームC', got {team.name}"
-            raise AssertionError(msg)
-        if manager.get_team_count() != AFTER_CREATE_TEAM_COUNT:
-            count = manager.get_team_count()
-            msg = f"Expected team count to be {AFTER_CREATE_TEAM_COUNT}, got {count}"
-            raise AssertionError(msg)
+        assert team.id == "team_c"
+        assert team.name == "チームC"
+        assert manager.get_team_count() == AFTER_CREATE_TEAM_COUNT
 
     def test_create_team_with_existing_id_raises_error(
-        self, manager: TeamManager,
+        self, shared_manager: TeamManager,
     ) -> None:
         """Test that creating a team with existing ID raises ValueError."""
         with pytest.raises(ValueError, match="既に存在します"):
-            manager.create_team("team_a", "新チームA")
+            shared_manager.create_team("team_a", "新チームA")
 
     def test_can_delete_team(self, manager: TeamManager) -> None:
         """Test that an existing team can be deleted successfully."""
         result = manager.delete_team("team_a")
 
-        if result is not True:
-            msg = f"Expected result to be True, got {result}"
-            raise AssertionError(msg)
-        if manager.get_team("team_a") is not None:
-            msg = "Expected team_a to be deleted (None)"
-            raise AssertionError(msg)
-        if manager.get_team_count() != AFTER_DELETE_TEAM_COUNT:
-            count = manager.get_team_count()
-            msg = f"Expected team count to be {AFTER_DELETE_TEAM_COUNT}, got {count}"
-            raise AssertionError(msg)
-
-    def test_delete_nonexistent_team_returns_false(self, manager: TeamManager) -> None:
+        assert result is True
+        assert manager.get_team("team_a") is None
+        assert manager.get_team_count() == AFTER_DELETE_TEAM_COUNT
+
+    def test_delete_nonexistent_team_returns_false(self, shared_manager: TeamManager) -> None:
         """Test that deleting a nonexistent team returns False."""
-        result = manager.delete_team("non_existent")
+        result = shared_manager.delete_team("non_existent")
 
-        if result is not False:
-            msg = f"Expected result to be False, got {result}"
-            raise AssertionError(msg)
+        assert result is False
 
-    def test_check_team_existence(self, manager: TeamManager) -> None:
+    @pytest.mark.parametrize(
+        ("team_id", "expected"),
+        [("team_a", True), ("team_b", True), ("non_existent", False)],
+    )
+    def test_check_team_existence(self, shared_manager: TeamManager, team_id: str, *, expected: bool) -> None:
         """Test team existence checking functionality."""
-        if manager.team_exists("team_a") is not True:
-            msg = "Expected team_a to exist"
-            raise AssertionError(msg)
-        if manager.team_exists("non_existent") is not False:
-            msg = "Expected non_existent team to not exist"
-            raise AssertionError(msg)
+        assert shared_manager.team_exists(team_id) is expected
 
     def test_can_get_team_count(self, manager: TeamManager) -> None:
         """Test that team count can be retrieved and changes with operations."""
-        if manager.get_team_count() != INITIAL_TEAM_COUNT:
-            count = manager.get_team_count()
-            msg = f"Expected initial count to be {INITIAL_TEAM_COUNT}, got {count}"
-            raise AssertionError(msg)
+        assert manager.get_team_count() == INITIAL_TEAM_COUNT
 
         manager.create_team("team_c", "チームC")
-        if manager.get_team_count() != AFTER_CREATE_TEAM_COUNT:
-            count = manager.get_team_count()
-            msg = (
-                f"Expected count after create to be {AFTER_CREATE_TEAM_COUNT}, "
-                f"got {count}"
-            )
-            raise AssertionError(msg)
+        assert manager.get_team_count() == AFTER_CREATE_TEAM_COUNT
 
         manager.delete_team("team_a")
-        if manager.get_team_count() != INITIAL_TEAM_COUNT:
-            count = manager.get_team_count()
-            msg = f"Expected final count to be {INITIAL_TEAM_COUNT}, got {count}"
-            raise AssertionError(msg)
+        assert manager.get_team_count() == INITIAL_TEAM_COUNT
 
-    def test_config_error_handling(self) -> None:
+    def test_config_error_handling(self, mock_config_manager: Mock) -> None:
         """設定エラーのハンドリングをテスト."""
-        with patch("src.presentation.team_manager.TeamConfigManager") as mock_config_manager_class:
-            mock_config_manager = Mock()
-            mock_config_manager_class.return_value = mock_config_manager
-
-            # 設定エラーをシミュレート
-            mock_config_manager.load_all_teams.side_effect = ConfigurationError("テストエラー")
+        # 設定エラーをシミュレート
+        mock_config_manager.load_all_teams.side_effect = ConfigurationError("テストエラー")
 
-            manager = TeamManager()
+        manager = TeamManager()
 
-            if not manager.has_config_error():
-                msg = "Expected config error to be detected"
-                raise AssertionError(msg)
+        assert manager.has_config_error()
+        assert manager.get_config_error() == "テストエラー"
+        assert manager.get_team_count() == 0
 
-            if manager.get_config_error() != "テストエラー":
-                msg = f"Expected error message 'テストエラー', got {manager.get_config_error()}"
-                raise AssertionError(msg)
-
-            if manager.get_team_count() != 0:
-                msg = f"Expected 0 teams when config error occurs, got {manager.get_team_count()}"
-                raise AssertionError(msg)
-
-    def test_reload_config_success(self) -> None:
+    def test_reload_config_success(self, mock_config_manager: Mock) -> None:
         """設定ファイルの再読み込み成功テスト."""
-        with patch("src.presentation.team_manager.TeamConfigManager") as mock_config_manager_class:
-            mock_config_manager = Mock()
-            mock_config_manager_class.return_value = mock_config_manager
-
-            # 最初はエラー
-            mock_config_manager.load_all_teams.side_effect = ConfigurationError("初回エラー")
-            manager = TeamManager()
+        # 最初はエラー
+        mock_config_manager.load_all_teams.side_effect = ConfigurationError("初回エラー")
+        manager = TeamManager()
 
-            if not manager.has_config_error():
-                msg = "Expected initial config error"
-                raise AssertionError(msg)
+        assert manager.has_config_error()
 
-            # 再読み込みで成功
-            mock_config_manager.load_all_teams.side_effect = None
-            mock_config_manager.load_all_teams.return_value = {
-                "team_c": Team(id="team_c", name="チームC", description="新チーム"),
-            }
-
-            manager.reload_config()
+        # 再読み込みで成功
+        mock_config_manager.load_all_teams.side_effect = None
+        mock_config_manager.load_all_teams.return_value = {
+            "team_c": Team(id="team_c", name="チームC", description="新チーム"),
+        }
 
-            if manager.has_config_error():
-                msg = f"Expected no config error after reload, got {manager.get_config_error()}"
-                raise AssertionError(msg)
+        manager.reload_config()
 
-            if manager.get_team_count() != 1:
-                msg = f"Expected 1 team after reload, got {manager.get_team_count()}"
-                raise AssertionError(msg)
+        assert not manager.has_config_error()
+        assert manager.get_team_count() == 1
 
-    def test_get_team_data_format(self) -> None:
+    def test_get_team_data_format(self, mock_config_manager: Mock) -> None:
         """チームのデータフォーマット設定取得テスト."""
-        with patch("src.presentation.team_manager.TeamConfigManager") as mock_config_manager_class:
-            mock_config_manager = Mock()
-            mock_config_manager_class.return_value = mock_config_manager
+        # 正常ケース
+        mock_config_manager.load_all_teams.return_value = {}
+        mock_config_manager.load_team_data_format.return_value = {
+            "columns": [{"name": "test_col", "type": "string"}],
+        }
 
-            # 正常ケース
-            mock_config_manager.load_all_teams.return_value = {}
-            mock_config_manager.load_team_data_format.return_value = {
-                "columns": [{"name": "test_col", "type": "string"}],
-            }
+        manager = TeamManager()
+        result = manager.get_team_data_format("team_a")
 
-            manager = TeamManager()
-            result = manager.get_team_data_format("team_a")
+        assert result is not None
+        assert "columns" in result
 
-            if result is None:
-                msg = "Expected data format to be returned"
-                raise AssertionError(msg)
+        # エラーケース
+        mock_config_manager.load_team_data_format.side_effect = ConfigurationError("テストエラー")
+        result = manager.get_team_data_format("team_a")
 
-            if "columns" not in result:
-                msg = "Expected 'columns' in data format"
-                raise AssertionError(msg)
+        assert result is None
 
-            # エラーケース
-            mock_config_manager.load_team_data_format.side_effect = ConfigurationError("テストエラー")
-            result = manager.get_team_data_format("team_a")
+    def test_get_team_calculation_rules(self, mock_config_manager: Mock) -> None:
+        """チームの計算ルール設定取得テスト."""
+        mock_rules = [CalculationRule(name="test_rule", formula="a + b", description="テスト")]
+        mock_config_manager.load_all_teams.return_value = {}
+        mock_config_manager.load_team_calculation_rules.return_value = mock_rules
 
-            if result is not None:
-                msg = f"Expected None on error, got {result}"
-                raise AssertionError(msg)
+        manager = TeamManager()
+        result = manager.get_team_calculation_rules("team_a")
 
-    def test_get_team_calculation_rules(self) -> None:
-        """チームの計算ルール設定取得テスト."""
-        with patch("src.presentation.team_manager.TeamConfigManager") as mock_config_manager_class:
-            mock_config_manager = Mock()
-            mock_config_manager_class.return_value = mock_config_manager
-            mock_rules = [CalculationRule(name="test_rule", formula="a + b", description="テスト")]
-            mock_config_manager.load_all_teams.return_value = {}
-            mock_config_manager.load_team_calculation_rules.return_value = mock_rules
+        assert result is not None
+        assert len(result) == 1
+        assert result[0].name == "test_rule"
+
+        # エラーケース
+        mock_config_manager.load_team_calculation_rules.side_effect = ConfigurationError("テストエラー")
+        result = manager.get_team_calculation_rules("team_a")
 
-            manager = TeamManager()
-            result = manager.get_team_calculation_rules("team_a")
+        assert result is None
 
-            if result is None:
-                msg = "Expected calculation rules to be returned"
-                raise AssertionError(msg)
+    def test_get_team_data_version(self) -> None:
+        """データソースのバージョン取得テスト(取得できない場合はNone)."""
+        config_manager = Mock()
+        config_manager.load_all_teams.return_value = {}
+        data_reader = Mock()
+        data_reader.get_source_version.return_value = 123
+        manager = TeamManager(config_manager, data_reader)
 
-            if len(result) != 1:
-                msg = f"Expected 1 rule, got {len(result)}"
-                raise AssertionError(msg)
+        assert manager.get_team_data_version("team_a") == 123
 
-            if result[0].name != "test_rule":
-                msg = f"Expected rule name 'test_rule', got {result[0].name}"
-                raise AssertionError(msg)
+        data_reader.get_source_version.side_effect = DataSourceError("テストエラー")
+        assert manager.get_team_data_version("team_a") is None
 
-            # エラーケース
-            mock_config_manager.load_team_calculation_rules.side_effect = ConfigurationError("テストエラー")
-            result = manager.get_team_calculation_rules("team_a")
+    def test_compute_with_rules_uses_given_rules(self, mock_config_manager: Mock) -> None:
+        """計算ルールを渡した場合は設定から読み込み直さない."""
+        mock_config_manager.load_all_teams.return_value = {}
+        manager = TeamManager()
+        df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
 
-            if result is not None:
-                msg = f"Expected None on error, got {result}"
-                raise AssertionError(msg)
+        result = manager.compute_with_rules("team_a", df, (CalculationRule(name="total", formula="a + b"),))
 
+        mock_config_manager.load_team_calculation_rules.assert_not_called()
+        assert result["total"].tolist() == [4, 6]